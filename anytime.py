@@ -0,0 +1,185 @@
+import time
+from array import array
+from frontier import IndexedHeap
+from heuristics import h_manhattan_distance
+from headless import SearchResult, _prepare, _neighbors, _found, _require_dense
+
+# Anytime A* (ARA*: Likhachev, Gordon and Thrun, 2003).
+#
+# A* with the heuristic multiplied by a weight w > 1 finds a path quickly, at most w times the cost of
+# the cheapest one. ARA* then lowers w step by step and searches again, but each pass reuses the
+# g values of the previous ones: only the cells whose g improved since they were expanded (kept in
+# an INCONS list) are put back on the open list, so the later passes are much cheaper than fresh
+# searches. After the pass with w = 1 the path is optimal.
+#
+# AnytimeAStar keeps all of that state between calls, so a controller with a fixed budget per tick
+# can call improve() once per tick: it picks up where the last call stopped, and returns the best path
+# so far with a bound on how far it can be from optimal.
+
+
+class AnytimeResult(SearchResult):
+    def __init__(self, found: bool, path: list[tuple[int, int]], cost: float, expanded: int, max_frontier: int = 0,
+                 bound: float = float("inf"), weight: float = float("inf")):
+        """
+        The best path of an anytime search so far.
+        Args:
+            bound (float): Its cost is at most bound times the cost of the cheapest path (1 = optimal).
+            weight (float): The heuristic weight of the pass that found it.
+        """
+        super().__init__(found, path, cost, expanded, max_frontier)
+        self.bound: float = bound
+        self.weight: float = weight
+
+    def __repr__(self) -> str:
+        return (f"AnytimeResult(found={self.found}, cost={self.cost}, bound={self.bound:.3f}, weight={self.weight}, "
+                f"expanded={self.expanded}, path_len={len(self.path)})")
+
+
+class AnytimeAStar:
+    def __init__(self, grid, start, end, heuristic=h_manhattan_distance, weight: float = 3.0, decrement: float = 0.5):
+        """
+        Set up an anytime search. Nothing is expanded until improve() is called.
+        Args:
+            grid (Grid | CompactGrid): The map. Its barriers and costs are read once, here.
+            start (Spot | tuple[int, int]): Where the path starts.
+            end (Spot | tuple[int, int]): Where it ends.
+            heuristic (callable): An admissible heuristic, h(p1, p2) (see heuristics.py and landmarks.py).
+            weight (float): The weight of the first pass (at least 1).
+            decrement (float): How much the weight drops after every pass.
+        """
+        if weight < 1:
+            raise ValueError(f"weight must be at least 1, got {weight}")
+        if decrement <= 0:
+            raise ValueError(f"decrement must be positive, got {decrement}")
+        _require_dense(grid, "AnytimeAStar")
+        self.rows, self.cols, self.walls, self.costs, self.start, self.end = _prepare(grid, start, end)
+        self.heuristic = heuristic
+        self.weight: float = weight
+        self.decrement: float = decrement
+        self.goal: tuple[int, int] = divmod(self.end, self.cols)
+        n = self.rows * self.cols
+        self.g: array = array("d", [float("inf")]) * n
+        self.came_from: array = array("i", [-1]) * n
+        self.closed: bytearray = bytearray(n)
+        self.incons: set[int] = set()
+        self.h_cache: dict[int, float] = {}
+        self.open = IndexedHeap(n)
+        self.g[self.start] = 0
+        self.open.push(self.start, self._key(self.start))
+        self.expanded: int = 0
+        self.max_frontier: int = 0
+        self.done: bool = False   # True once the path is optimal, or known not to exist
+        self.best: AnytimeResult = AnytimeResult(False, [], float("inf"), 0)
+
+    def _h(self, idx: int) -> float:
+        h = self.h_cache.get(idx)
+        if h is None:
+            h = self.h_cache[idx] = self.heuristic(divmod(idx, self.cols), self.goal)
+        return h
+
+    def _key(self, idx: int) -> tuple[float, float]:
+        # ties on f go to the smaller h, like astar
+        h = self._h(idx)
+        return self.g[idx] + self.weight * h, h
+
+    def _improve_path(self, deadline: float, budget: int) -> bool:
+        """
+        Expand cells until no open cell can improve the path to end under the current weight.
+        Returns:
+            bool: True if the pass finished, False if the deadline or the budget stopped it first.
+        """
+        rows, cols, walls, costs = self.rows, self.cols, self.walls, self.costs
+        g, came_from, closed, open_set = self.g, self.came_from, self.closed, self.open
+        end = self.end
+        expanded = 0
+        while open_set and g[end] > open_set.min_priority()[0]:
+            if expanded >= budget or (deadline is not None and time.perf_counter() >= deadline):
+                self.expanded += expanded
+                return False
+            if len(open_set) > self.max_frontier:
+                self.max_frontier = len(open_set)
+            current, _ = open_set.pop()
+            closed[current] = 1
+            expanded += 1
+            for neighbor in _neighbors(current, rows, cols, walls):
+                temp_g_score = g[current] + (1 if costs is None else costs[neighbor])
+                if temp_g_score < g[neighbor]:
+                    g[neighbor] = temp_g_score
+                    came_from[neighbor] = current
+                    if closed[neighbor]:
+                        self.incons.add(neighbor)   # expanded already in this pass: revisit in the next one
+                    else:
+                        open_set.push(neighbor, self._key(neighbor))
+        self.expanded += expanded
+        return True
+
+    def _bound(self) -> float:
+        """
+        The suboptimality bound of the current path: its cost over the lowest unweighted f of the cells
+        that could still improve it, and never more than the weight.
+        """
+        g = self.g
+        lowest = min((g[idx] + self._h(idx) for idx in self.incons), default=float("inf"))
+        for _, _, idx in self.open.heap:
+            lowest = min(lowest, g[idx] + self._h(idx))
+        if lowest >= g[self.end]:
+            return 1.0
+        return min(self.weight, g[self.end] / lowest) if lowest > 0 else self.weight
+
+    def _publish(self) -> None:
+        # the parents of the cells on the path may have improved since g[end] was set, so the path
+        # that is read back can be cheaper than g[end]: its cost is added up along it
+        if self.g[self.end] < self.best.cost:
+            found = _found(self.came_from, self.end, self.cols, self.expanded, costs=self.costs, max_frontier=self.max_frontier)
+            self.best = AnytimeResult(True, found.path, found.cost, self.expanded, self.max_frontier, self._bound(), self.weight)
+        else:
+            self.best.bound = min(self.best.bound, self._bound())
+            self.best.expanded = self.expanded
+
+    def improve(self, deadline: float = None, max_expansions: int = None) -> AnytimeResult:
+        """
+        Run passes, lowering the weight after each, until the path is optimal or the budget runs out.
+        A pass cut short by the budget resumes at the next call.
+        Args:
+            deadline (float, optional): A time.perf_counter() value to stop at.
+            max_expansions (int, optional): The most cells to expand in this call.
+        Returns:
+            AnytimeResult: The best path so far (found is False until the first pass finishes) and its bound.
+        """
+        if self.start == self.end:
+            self.done = True
+            self.best = AnytimeResult(True, [self.goal], 0, 0, 0, 1.0, self.weight)
+        budget = float("inf") if max_expansions is None else max_expansions
+        while not self.done:
+            before = self.expanded
+            finished = self._improve_path(deadline, budget)
+            budget -= self.expanded - before
+            if not finished:
+                break
+            if self.g[self.end] == float("inf"):
+                self.done = True   # the pass emptied the open list without reaching end
+                break
+            self._publish()
+            if self.weight <= 1 or self.best.bound <= 1:
+                self.best.bound = 1.0
+                self.done = True
+                break
+            # next pass: a lower weight, the inconsistent cells back on the open list, all keys recomputed
+            self.weight = max(1.0, self.weight - self.decrement)
+            cells = [idx for _, _, idx in self.open.heap] + list(self.incons)
+            self.incons.clear()
+            self.open = IndexedHeap(self.rows * self.cols)
+            for idx in cells:
+                self.open.push(idx, self._key(idx))
+            self.closed = bytearray(self.rows * self.cols)
+        self.best.expanded = self.expanded
+        return self.best
+
+
+def ara(grid, start, end, heuristic=h_manhattan_distance, weight: float = 3.0, decrement: float = 0.5,
+        deadline: float = None, max_expansions: int = None) -> AnytimeResult:
+    """
+    Run an anytime search in one call, until the path is optimal, the deadline or the expansion budget.
+    See AnytimeAStar for the arguments.
+    """
+    return AnytimeAStar(grid, start, end, heuristic, weight, decrement).improve(deadline, max_expansions)
@@ -0,0 +1,137 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import headless
+from field_cache import FieldCache
+
+# Plan many (start, end) queries on one map at once, spread over worker processes.
+# The map (barrier mask, and the cost layer if there is one) is written once into a shared memory
+# block; every worker searches it in place, through read-only views of the block, so the map is held
+# once however many workers there are, and the tasks only carry the two positions.
+
+# the headless searches a batch can run, by name
+ALGORITHMS = {
+    "bfs": headless.bfs,
+    "dfs": headless.dfs,
+    "astar": headless.astar,
+    "jps": headless.jps,
+    "ucs": headless.ucs,
+    "greedy": headless.greedy,
+    "bidirectional_bfs": headless.bidirectional_bfs,
+    "bidirectional_astar": headless.bidirectional_astar,
+    "cached": headless.cached_path,
+}
+
+
+class BatchResult:
+    def __init__(self, start: tuple[int, int], end: tuple[int, int], result: headless.SearchResult, seconds: float, worker: int):
+        """
+        The outcome of one query of a batch.
+        Args:
+            start (tuple[int, int]): The (row, col) position the query started from.
+            end (tuple[int, int]): The (row, col) position of its goal.
+            result (SearchResult): What the search returned (path, cost, nodes expanded).
+            seconds (float): How long the search took, in the worker.
+            worker (int): The process id of the worker that ran it.
+        """
+        self.start: tuple[int, int] = start
+        self.end: tuple[int, int] = end
+        self.result: headless.SearchResult = result
+        self.seconds: float = seconds
+        self.worker: int = worker
+
+    def __repr__(self) -> str:
+        return f"BatchResult({self.start} -> {self.end}, {self.result!r}, seconds={self.seconds:.6f})"
+
+
+class _SharedMap:
+    def __init__(self, rows: int, cols: int, walls: bytes | memoryview, costs: bytearray | memoryview | None):
+        """
+        The read-only map a worker searches on: just what the headless searches read from a grid.
+        In a worker, walls and costs are views of the shared memory block.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.walls: bytes | memoryview = walls
+        self.costs: bytearray | memoryview | None = costs
+        self.jump_table = None            # built by the first jps query of the worker, then reused (it keeps
+                                          # its own copy of the mask, see jps.JumpTable)
+        self.version: int = 0             # the map never changes during a batch
+        self.field_cache = FieldCache()   # reused by the "cached" queries of the worker
+
+    def barrier_mask(self) -> bytes | memoryview:
+        return self.walls
+
+
+_map: _SharedMap = None                       # the map of the batch, in each worker
+_search: callable = None                      # the search of the batch, in each worker
+_block: shared_memory.SharedMemory = None     # the shared block _map reads from, in each worker
+
+
+def _init_worker(name: str, rows: int, cols: int, has_costs: bool, algorithm: str) -> None:
+    """
+    Attach to the shared memory block when the worker starts. It stays open until the worker exits:
+    the map is read straight from it, never copied into the worker.
+    """
+    global _map, _search, _block
+    n = rows * cols
+    _block = shared_memory.SharedMemory(name=name)
+    buf = _block.buf.toreadonly()
+    _map = _SharedMap(rows, cols, buf[:n], buf[n:2 * n] if has_costs else None)
+    _search = ALGORITHMS[algorithm]
+
+
+def _run(pair: tuple[tuple[int, int], tuple[int, int]]) -> BatchResult:
+    start, end = pair
+    began = time.perf_counter()
+    result = _search(_map, start, end)
+    return BatchResult(start, end, result, time.perf_counter() - began, os.getpid())
+
+
+def plan_batch(grid, pairs: list[tuple[tuple[int, int], tuple[int, int]]], algorithm: str = "astar",
+               workers: int = None) -> list[BatchResult]:
+    """
+    Run one headless search per (start, end) pair, in parallel.
+    Args:
+        grid (Grid | CompactGrid): The map. Only its barriers and costs are read, the grid is not changed.
+        pairs (list[tuple[tuple[int, int], tuple[int, int]]]): The (row, col) positions of the starts and ends.
+        algorithm (str): One of the names in ALGORITHMS.
+        workers (int, optional): Number of worker processes (default: one per CPU).
+            With 1 the queries run in this process, without a pool.
+    Returns:
+        list[BatchResult]: One result per pair, in the order of pairs.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}")
+    pairs = [(tuple(start), tuple(end)) for start, end in pairs]
+    if not pairs:
+        return []
+    rows, cols = grid.rows, grid.cols
+    walls = grid.barrier_mask()
+    costs = grid.costs
+    workers = min(workers or os.cpu_count() or 1, len(pairs))
+
+    if workers == 1:
+        global _map, _search
+        _map = _SharedMap(rows, cols, bytes(walls), None if costs is None else bytearray(costs))
+        _search = ALGORITHMS[algorithm]
+        try:
+            return [_run(pair) for pair in pairs]
+        finally:
+            _map = _search = None
+
+    n = rows * cols
+    block = shared_memory.SharedMemory(create=True, size=2 * n if costs is not None else n)
+    try:
+        block.buf[:n] = walls
+        if costs is not None:
+            block.buf[n:2 * n] = costs
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(block.name, rows, cols, costs is not None, algorithm)) as pool:
+            # a few chunks per worker: fewer round trips than one task per pair, and still balanced
+            chunksize = max(1, len(pairs) // (workers * 4))
+            return list(pool.map(_run, pairs, chunksize=chunksize))
+    finally:
+        block.close()
+        block.unlink()
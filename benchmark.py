@@ -0,0 +1,274 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import headless
+from compact_grid import CompactGrid
+
+# Benchmark the headless searches on seeded, reproducible map families.
+#
+#   python benchmark.py                                   # default sizes and families, table only
+#   python benchmark.py --sizes 30 300 1000 --json run.json
+#   python benchmark.py --json new.json --compare run.json  # time ratios against an earlier run
+#
+# Every (family, size) map is generated from the seed, so two runs on the same seed search the same maps.
+# Each algorithm is timed (best of --repeat runs), then run once more under tracemalloc for its peak memory.
+
+
+# ---- map families ----
+# each one fills the barrier mask of an n x n map and returns the start and end cells
+
+def _open_field(n: int, rng: random.Random, mask: bytearray) -> tuple[tuple[int, int], tuple[int, int]]:
+    return (0, 0), (n - 1, n - 1)
+
+
+def _random_obstacles(density: float):
+    def generate(n: int, rng: random.Random, mask: bytearray) -> tuple[tuple[int, int], tuple[int, int]]:
+        rnd = rng.random
+        for i in range(n * n):
+            if rnd() < density:
+                mask[i] = 1
+        mask[0] = mask[n * n - 1] = 0
+        return (0, 0), (n - 1, n - 1)
+    return generate
+
+
+def _maze(n: int, rng: random.Random, mask: bytearray) -> tuple[tuple[int, int], tuple[int, int]]:
+    # a perfect maze (one path between any two cells): the rooms are the cells with odd row and column,
+    # carved out by an iterative depth-first backtracker
+    mask[:] = b"\x01" * (n * n)
+    last = n - 2 if n % 2 == 1 else n - 3   # the largest odd index inside the border
+    if last < 1:
+        mask[:] = bytes(n * n)
+        return (0, 0), (n - 1, n - 1)
+    mask[n + 1] = 0
+    stack = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc, dr, dc) for dr, dc in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 1 <= row + dr <= last and 1 <= col + dc <= last and mask[(row + dr) * n + col + dc]]
+        if not options:
+            stack.pop()
+            continue
+        r, c, dr, dc = rng.choice(options)
+        mask[(row + dr // 2) * n + col + dc // 2] = 0
+        mask[r * n + c] = 0
+        stack.append((r, c))
+    return (1, 1), (last, last)
+
+
+def _rooms(n: int, rng: random.Random, mask: bytearray) -> tuple[tuple[int, int], tuple[int, int]]:
+    # square rooms separated by one-cell walls, with a door (a 2-cell gap) in every wall between two rooms
+    size = max(6, n // 12)
+    walls = list(range(size, n - 2, size + 1))   # the last room is at least 2 cells wide, room for a door
+    for line in walls:
+        for i in range(n):
+            mask[line * n + i] = 1   # horizontal wall
+            mask[i * n + line] = 1   # vertical wall
+    bounds = [0] + [w + 1 for w in walls]
+    for w in walls:
+        for lo in bounds:
+            hi = min(n, lo + size)
+            if hi - lo < 2:
+                continue
+            door = rng.randrange(lo, hi - 1)
+            for k in (door, door + 1):
+                mask[w * n + k] = 0   # door in the horizontal wall
+                mask[k * n + w] = 0   # door in the vertical wall
+    mask[0] = mask[n * n - 1] = 0
+    return (0, 0), (n - 1, n - 1)
+
+
+FAMILIES = {
+    "open": _open_field,
+    "random10": _random_obstacles(0.10),
+    "random20": _random_obstacles(0.20),
+    "random30": _random_obstacles(0.30),
+    "maze": _maze,
+    "rooms": _rooms,
+}
+
+
+def make_map(family: str, n: int, seed: int) -> tuple[CompactGrid, tuple[int, int], tuple[int, int]]:
+    """
+    Generate one map of a family.
+    Args:
+        family (str): One of the names in FAMILIES.
+        n (int): The map is n x n.
+        seed (int): The seed; the same (family, n, seed) always gives the same map.
+    Returns:
+        tuple[CompactGrid, tuple[int, int], tuple[int, int]]: The map, its start and its end.
+    """
+    rng = random.Random(f"{family}/{n}/{seed}")
+    grid = CompactGrid(n, n)
+    for _ in range(100):
+        mask = bytearray(n * n)
+        start, end = FAMILIES[family](n, rng, mask)
+        grid.cells[:] = mask   # BARRIER is 1, so the mask is the cell states
+        grid.version += 1
+        # keep only maps where end can be reached (dense random maps are sometimes cut in two),
+        # otherwise the iterative deepening searches would only measure how long they take to give up
+        if headless.bfs(grid, start, end, vectorized=True).found:
+            return grid, start, end
+    raise RuntimeError(f"could not generate a {family} map of size {n} where the end can be reached")
+
+
+# ---- algorithms ----
+# name -> (search, the largest number of cells it is run on); the uninformed depth-first
+# families blow up on big maps, so they are only run on the small ones
+
+ALGORITHMS = {
+    "bfs": (headless.bfs, None),
+    "dfs": (headless.dfs, None),
+    "astar": (headless.astar, None),
+    "dls": (lambda grid, start, end: headless.dls(grid, start, end, grid.rows * grid.cols), 100 * 100),
+    "ucs": (headless.ucs, None),
+    "greedy": (headless.greedy, None),
+    "iddfs": (headless.iddfs, 40 * 40),
+    "ida": (headless.ida, 30 * 30),
+    "jps": (headless.jps, None),
+    "bidirectional_bfs": (headless.bidirectional_bfs, None),
+    "bidirectional_astar": (headless.bidirectional_astar, None),
+    "bfs_vectorized": (lambda grid, start, end: headless.bfs(grid, start, end, vectorized=True), None),
+}
+
+DEFAULT_SIZES = [30, 100, 300]
+
+
+def measure(search: callable, grid: CompactGrid, start: tuple[int, int], end: tuple[int, int],
+            repeat: int = 3, memory: bool = True) -> dict:
+    """
+    Time one search on one map.
+    Args:
+        search (callable): A headless search, search(grid, start, end) -> SearchResult.
+        grid (CompactGrid): The map.
+        start (tuple[int, int]): The start cell.
+        end (tuple[int, int]): The end cell.
+        repeat (int): The search is run this many times, the best time is kept.
+        memory (bool): Run it once more under tracemalloc for the peak memory.
+    Returns:
+        dict: seconds, found, cost, expanded, max_frontier and peak_bytes (None without memory).
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = search(grid, start, end)
+        best = min(best, time.perf_counter() - began)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            search(grid, start, end)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "found": result.found,
+        "cost": result.cost if result.found else None,
+        "expanded": result.expanded,
+        "max_frontier": result.max_frontier,
+        "peak_bytes": peak,
+    }
+
+
+def run(families: list[str], sizes: list[int], algorithms: list[str], seed: int = 0,
+        repeat: int = 3, memory: bool = True, log=None) -> dict:
+    """
+    Run every algorithm on every (family, size) map.
+    Args:
+        log (callable, optional): Called with every finished record (e.g. to print progress).
+    Returns:
+        dict: The machine information, the settings and one record per (family, size, algorithm).
+    """
+    records = []
+    for family in families:
+        for n in sizes:
+            grid, start, end = make_map(family, n, seed)
+            for name in algorithms:
+                search, max_cells = ALGORITHMS[name]
+                record = {"family": family, "size": n, "algorithm": name}
+                if max_cells is not None and n * n > max_cells:
+                    record["skipped"] = True
+                else:
+                    record.update(measure(search, grid, start, end, repeat, memory))
+                records.append(record)
+                if log is not None:
+                    log(record)
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "records": records,
+    }
+
+
+def _row(record: dict) -> str:
+    head = f"{record['family']:<10} {record['size']:>5} {record['algorithm']:<20}"
+    if record.get("skipped"):
+        return head + "  skipped (map too large)"
+    cost = "-" if record["cost"] is None else f"{record['cost']:g}"
+    peak = "-" if record["peak_bytes"] is None else f"{record['peak_bytes'] / 1024:.0f}"
+    return head + (f" {record['seconds'] * 1000:>10.2f} {record['expanded']:>10} {record['max_frontier']:>9}"
+                   f" {peak:>10} {cost:>8}")
+
+
+HEADER = (f"{'family':<10} {'size':>5} {'algorithm':<20} {'time (ms)':>10} {'expanded':>10} {'frontier':>9}"
+          f" {'peak (KiB)':>10} {'cost':>8}")
+
+
+def compare(new: dict, old: dict) -> list[str]:
+    """
+    Compare two runs: the time ratio (new / old) of every record both have, and the records whose
+    path cost changed (which would be a correctness regression, not a performance one).
+    """
+    key = lambda r: (r["family"], r["size"], r["algorithm"])
+    before = {key(r): r for r in old["records"] if not r.get("skipped")}
+    lines = []
+    for record in new["records"]:
+        other = before.get(key(record))
+        if other is None or record.get("skipped"):
+            continue
+        ratio = record["seconds"] / other["seconds"] if other["seconds"] else float("inf")
+        note = "" if record["cost"] == other["cost"] else f"  COST CHANGED {other['cost']} -> {record['cost']}"
+        lines.append(f"{record['family']:<10} {record['size']:>5} {record['algorithm']:<20} {ratio:>7.2f}x{note}")
+    return lines
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the headless searches on seeded map families.")
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="map sizes, from 30 up to 4000")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per search, the best time is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="a JSON file of an earlier run to compare the times with")
+    args = parser.parse_args(argv)
+
+    print(HEADER)
+    results = run(args.families, args.sizes, args.algorithms, args.seed, args.repeat, not args.no_memory,
+                  log=lambda record: print(_row(record), flush=True))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print()
+        print("time ratio against", args.compare)
+        for line in compare(results, old):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from terrain import TerrainCosts
+from field_cache import FieldCache
+
+# Cell states. Every cell is one byte in CompactGrid.cells, and each state is one bit of that byte.
+EMPTY = 0
+BARRIER = 1
+OPEN = 2
+CLOSED = 4
+START = 8
+END = 16
+PATH = 32
+
+# translation table that maps a cell byte to 1 if it is a barrier, 0 otherwise
+_BARRIER_TABLE = bytes(1 if value & BARRIER else 0 for value in range(256))
+# translation table that keeps only the barrier, start and end bits (drops the search marks)
+_KEEP_MAP_TABLE = bytes(value & (BARRIER | START | END) for value in range(256))
+
+
+class CompactGrid(TerrainCosts):
+    def __init__(self, rows: int, cols: int):
+        """
+        A grid that keeps the state of every cell in a flat bytearray indexed by row*cols+col,
+        instead of one Spot object per cell. It does not depend on pygame.
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.cells: bytearray = bytearray(rows * cols)
+        self.costs: bytearray | None = None  # traversal cost layer, see terrain.py
+        self.jump_table = None                # built on demand by jps.jump_table
+        self.version: int = 0                 # bumped whenever the barriers or costs change (bump it by hand
+                                              # after writing barriers into cells directly)
+        self.field_cache = FieldCache()       # distance fields of the goals queried often, see field_cache.py
+
+    @classmethod
+    def from_grid(cls, grid) -> "CompactGrid":
+        """
+        Copy the barriers, start, end and traversal costs of a Spot based Grid.
+        Args:
+            grid (Grid): The grid to copy.
+        Returns:
+            CompactGrid: A compact grid with the same map.
+        """
+        compact = cls(grid.rows, grid.cols)
+        for row in grid.grid:
+            for spot in row:
+                compact.cells[compact.index(spot.row, spot.col)] = spot.state & (BARRIER | START | END)
+        if grid.costs is not None:
+            compact.costs = bytearray(grid.costs)
+        return compact
+
+    def index(self, row: int, col: int) -> int:
+        """
+        Get the flat index of the cell at (row, col).
+        """
+        return row * self.cols + col
+
+    def position(self, idx: int) -> tuple[int, int]:
+        """
+        Get the (row, col) position of the cell with the given flat index.
+        """
+        return divmod(idx, self.cols)
+
+    def spot(self, row: int, col: int) -> "SpotView":
+        """
+        Get a Spot-like view of the cell at (row, col). Views are created on demand and hold no state.
+        """
+        return SpotView(self, row, col)
+
+    def barrier_mask(self) -> bytes:
+        """
+        Get a copy of the grid where every barrier is 1 and every other cell is 0.
+        Returns:
+            bytes: The barrier mask, indexed by row*cols+col.
+        """
+        return self.cells.translate(_BARRIER_TABLE)
+
+    def clear_search(self) -> None:
+        """
+        Remove the open, closed and path marks, keeping the barriers, start and end.
+        Returns:
+            None
+        """
+        self.cells[:] = self.cells.translate(_KEEP_MAP_TABLE)
+
+    def reset(self) -> None:
+        """
+        Reset every cell to empty and drop the traversal costs.
+        Returns:
+            None
+        """
+        self.cells[:] = bytes(len(self.cells))
+        self.version += 1
+        self.clear_costs()
+
+
+class SpotView:
+    # no __dict__, a view is just a reference to the grid and a position
+    __slots__ = ("grid", "row", "col", "idx")
+
+    def __init__(self, grid: CompactGrid, row: int, col: int):
+        """
+        A thin view over one cell of a CompactGrid, with the same state methods (and flag semantics) as Spot.
+        Args:
+            grid (CompactGrid): The grid that owns the cell.
+            row (int): The row index of the cell.
+            col (int): The column index of the cell.
+        """
+        self.grid: CompactGrid = grid
+        self.row: int = row
+        self.col: int = col
+        self.idx: int = row * grid.cols + col
+
+    def get_position(self) -> tuple[int, int]:
+        return self.row, self.col
+
+    def is_closed(self) -> bool:
+        return self.grid.cells[self.idx] & CLOSED != 0
+
+    def is_open(self) -> bool:
+        return self.grid.cells[self.idx] & OPEN != 0
+
+    def is_barrier(self) -> bool:
+        return self.grid.cells[self.idx] & BARRIER != 0
+
+    def is_start(self) -> bool:
+        return self.grid.cells[self.idx] & START != 0
+
+    def is_end(self) -> bool:
+        return self.grid.cells[self.idx] & END != 0
+
+    def _set(self, state: int) -> None:
+        # replace the state, counting a change of the barrier flag as a change of the map
+        cells = self.grid.cells
+        if (cells[self.idx] ^ state) & BARRIER:
+            self.grid.version += 1
+        cells[self.idx] = state
+
+    def reset(self) -> None:
+        self._set(EMPTY)
+
+    def make_closed(self) -> None:
+        self.grid.cells[self.idx] = (self.grid.cells[self.idx] & ~OPEN) | CLOSED
+
+    def make_open(self) -> None:
+        self.grid.cells[self.idx] = (self.grid.cells[self.idx] & ~CLOSED) | OPEN
+
+    def make_barrier(self) -> None:
+        self._set(BARRIER)
+
+    def make_start(self) -> None:
+        self._set(START)
+
+    def make_end(self) -> None:
+        self._set(END)
+
+    def make_path(self) -> None:
+        self.grid.cells[self.idx] |= PATH
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SpotView) and other.grid is self.grid and other.idx == self.idx
+
+    def __hash__(self) -> int:
+        return hash((id(self.grid), self.idx))
+
+    def __lt__(self, other: "SpotView") -> bool:
+        return False
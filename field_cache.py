@@ -0,0 +1,150 @@
+from array import array
+from collections import OrderedDict
+from frontier import make_frontier
+
+# Reverse distance fields: for one goal, the cost of the cheapest path from every cell to that goal.
+# With the field of a goal, a path from any start is found by walking "downhill": from each cell,
+# move to a neighbor whose distance is exactly the cost of that move lower. That takes O(path length)
+# instead of a whole search, so the fields of the goals that are queried often are kept in a FieldCache.
+#
+# A field is a flat sequence indexed by row*cols+col, with UNREACHED (-1) for the cells that cannot
+# reach the goal. It is only valid for the map it was computed on, so the grids count their changes
+# in grid.version (barriers and costs), and the cache drops every field once the version moves on.
+
+UNREACHED = -1
+
+
+def reverse_field(rows: int, cols: int, walls: bytes, costs: bytearray, goal: int):
+    """
+    Compute the distance from every cell to goal.
+    Args:
+        rows (int): Number of rows of the map.
+        cols (int): Number of columns of the map.
+        walls (bytes): The barrier mask (1 = barrier), indexed by row*cols+col.
+        costs (bytearray): The cost of entering each cell, None when every move costs 1.
+        goal (int): The flat index of the goal.
+    Returns:
+        The distances, indexed by row*cols+col, UNREACHED where the goal cannot be reached.
+        An array('i') for unit costs (filled with wavefront.py), an array('q') otherwise.
+    """
+    if costs is None:
+        # every move costs 1, so the distance to the goal is the distance from it; the NumPy result
+        # is copied into a plain array because reading it one cell at a time is much cheaper there
+        from wavefront import distance_field
+        dist = array("i")
+        dist.frombytes(distance_field(rows, cols, walls, goal).dist.tobytes())
+        return dist
+
+    # Dijkstra from the goal, backwards: moving from x into its neighbor y costs costs[y]
+    n = rows * cols
+    dist = array("q", [UNREACHED]) * n
+    done = bytearray(n)
+    dist[goal] = 0
+    pq = make_frontier(n, 0)
+    pq.push(goal, 0)
+    while pq:
+        y, d = pq.pop()
+        done[y] = 1
+        nd = d + costs[y]
+        row, col = divmod(y, cols)
+        for x, inside in ((y + cols, row < rows - 1), (y - cols, row > 0), (y + 1, col < cols - 1), (y - 1, col > 0)):
+            if inside and not walls[x] and not done[x] and (dist[x] == UNREACHED or nd < dist[x]):
+                dist[x] = nd
+                pq.push(x, nd)
+    return dist
+
+
+def descend(field, rows: int, cols: int, costs: bytearray, start: int) -> list[int]:
+    """
+    Follow a reverse distance field downhill from start to its goal.
+    Args:
+        field: The distances to the goal, as returned by reverse_field.
+        rows (int): Number of rows of the map.
+        cols (int): Number of columns of the map.
+        costs (bytearray): The cost layer the field was computed with, None for unit costs.
+        start (int): The flat index of the cell to start from.
+    Returns:
+        list[int]: The flat indices from start to the goal (both included), empty if the goal cannot be reached.
+    """
+    d = field[start]
+    if d == UNREACHED:
+        return []
+    path = [start]
+    current = start
+    while d > 0:
+        row, col = divmod(current, cols)
+        # same order as the neighbor lists: down, up, right, left
+        for nxt, inside in ((current + cols, row < rows - 1), (current - cols, row > 0),
+                            (current + 1, col < cols - 1), (current - 1, col > 0)):
+            if not inside:
+                continue
+            rest = field[nxt]
+            if rest != UNREACHED and rest + (1 if costs is None else costs[nxt]) == d:
+                current, d = nxt, rest
+                break
+        path.append(current)
+    return path
+
+
+class FieldCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Keep the reverse distance fields of the most recently used goals of one grid.
+        The least recently used fields are evicted once their total size goes over max_bytes.
+        Args:
+            max_bytes (int): The memory budget of the cached fields, in bytes.
+        """
+        self.max_bytes: int = max_bytes
+        self.fields: OrderedDict = OrderedDict()   # (goal, version) -> field, least recently used first
+        self.size: int = 0                         # bytes used by the fields
+        self.version: int = -1                     # map version the fields were computed for
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def clear(self) -> None:
+        """
+        Drop every cached field.
+        Returns:
+            None
+        """
+        self.fields.clear()
+        self.size = 0
+
+    def field(self, grid, goal: int, walls: bytes = None):
+        """
+        Get the reverse distance field of goal for the current map of the grid, computing it if needed.
+        Args:
+            grid (Grid | CompactGrid): The grid (its rows, cols, costs and version are read).
+            goal (int): The flat index of the goal.
+            walls (bytes, optional): The barrier mask of the grid, if the caller already has it.
+        Returns:
+            The field, see reverse_field.
+        """
+        version = grid.version
+        if version != self.version:
+            # the barriers or costs changed: every field is stale
+            self.clear()
+            self.version = version
+
+        key = (goal, version)
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+            return field
+
+        self.misses += 1
+        if walls is None:
+            walls = grid.barrier_mask()
+        field = reverse_field(grid.rows, grid.cols, walls, grid.costs, goal)
+        nbytes = len(field) * field.itemsize
+        if nbytes <= self.max_bytes:
+            self.fields[key] = field
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                _, old = self.fields.popitem(last=False)
+                self.size -= len(old) * old.itemsize
+        return field
@@ -0,0 +1,253 @@
+from array import array
+from itertools import count
+
+# Open lists ("frontiers") for the best-first searches.
+# Items are flat cell indices (row*cols+col), so the position of every item in the heap
+# can be kept in a flat array and looked up in O(1). That gives decrease-key without
+# duplicated entries: the open list holds at most one entry per cell.
+
+
+class IndexedHeap:
+    def __init__(self, size: int, allocate: callable = None):
+        """
+        A binary min-heap of cell indices with decrease-key. It takes no locks (unlike queue.PriorityQueue).
+        Ties are broken in insertion order, like the (priority, counter, item) tuples used before.
+        Args:
+            size (int): Number of cells in the grid (the largest index is size-1).
+            allocate (callable, optional): allocate(typecode, fill) builds the per-cell table instead of a
+                flat array (e.g. a tiled one, see sparse_grid.py).
+        """
+        self.heap: list[tuple[float, int, int]] = []   # (priority, tie, item)
+        # position of each item in heap, -1 if not in it
+        self.pos: array = array("i", [-1]) * size if allocate is None else allocate("i", -1)
+        self.tie = count()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __bool__(self) -> bool:
+        return bool(self.heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self.pos[item] >= 0
+
+    def priority(self, item: int) -> float:
+        """
+        Get the priority of an item that is in the heap.
+        """
+        return self.heap[self.pos[item]][0]
+
+    def min_priority(self) -> float:
+        """
+        Get the lowest priority in the heap (it must not be empty).
+        """
+        return self.heap[0][0]
+
+    def push(self, item: int, priority: float) -> bool:
+        """
+        Insert the item, or lower its priority if it is already in the heap.
+        Args:
+            item (int): The cell index.
+            priority (float): The priority, lower comes out first. Anything comparable works, e.g. an (f, h) tuple.
+        Returns:
+            bool: True if the heap changed, False if the item was already in with a lower or equal priority.
+        """
+        i = self.pos[item]
+        if i >= 0:
+            if priority >= self.heap[i][0]:
+                return False
+            self.heap[i] = (priority, next(self.tie), item)
+        else:
+            i = len(self.heap)
+            self.heap.append((priority, next(self.tie), item))
+        self._sift_up(i)
+        return True
+
+    def pop(self) -> tuple[int, float]:
+        """
+        Remove the item with the lowest priority.
+        Returns:
+            tuple[int, float]: The item and its priority.
+        """
+        heap = self.heap
+        last = heap.pop()
+        if heap:
+            top = heap[0]
+            heap[0] = last
+            self.pos[last[2]] = 0
+            self._sift_down(0)
+        else:
+            top = last
+        self.pos[top[2]] = -1
+        return top[2], top[0]
+
+    def update(self, item: int, priority: float) -> None:
+        """
+        Insert the item, or change its priority in either direction (push only ever lowers it).
+        """
+        i = self.pos[item]
+        if i < 0:
+            self.push(item, priority)
+            return
+        self.heap[i] = (priority, next(self.tie), item)
+        self._sift_up(i)
+        self._sift_down(self.pos[item])
+
+    def remove(self, item: int) -> None:
+        """
+        Take the item out of the heap, if it is in it.
+        """
+        i = self.pos[item]
+        if i < 0:
+            return
+        heap = self.heap
+        last = heap.pop()
+        self.pos[item] = -1
+        if i < len(heap):
+            heap[i] = last
+            self.pos[last[2]] = i
+            self._sift_up(i)
+            self._sift_down(self.pos[last[2]])
+
+    def _sift_up(self, i: int) -> None:
+        heap, pos = self.heap, self.pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            above = heap[parent]
+            if entry < above:
+                heap[i] = above
+                pos[above[2]] = i
+                i = parent
+            else:
+                break
+        heap[i] = entry
+        pos[entry[2]] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, pos = self.heap, self.pos
+        n = len(heap)
+        entry = heap[i]
+        child = 2 * i + 1
+        while child < n:
+            right = child + 1
+            if right < n and heap[right] < heap[child]:
+                child = right
+            below = heap[child]
+            if below < entry:
+                heap[i] = below
+                pos[below[2]] = i
+                i = child
+                child = 2 * i + 1
+            else:
+                break
+        heap[i] = entry
+        pos[entry[2]] = i
+
+
+class BucketQueue:
+    def __init__(self, size: int, allocate: callable = None):
+        """
+        A bucket queue (Dial's algorithm) for small non-negative integer priorities: bucket p holds the items
+        with priority p, so push and pop are O(1) instead of O(log n).
+        A decrease-key leaves a stale copy in the old bucket, which is skipped when it comes up.
+        Inside a bucket the last pushed item comes out first, which for A* means the deeper node
+        (the same tie-break as the (f, h) priorities on IndexedHeap).
+        Args:
+            size (int): Number of cells in the grid (the largest index is size-1).
+            allocate (callable, optional): allocate(typecode, fill) builds the per-cell table, as for IndexedHeap.
+        """
+        self.buckets: list[list[int]] = []
+        # current priority of each item, -1 if not in the queue
+        self.prio: array = array("q", [-1]) * size if allocate is None else allocate("q", -1)
+        self.current: int = 0                        # no bucket below this one holds a live item
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def __contains__(self, item: int) -> bool:
+        return self.prio[item] >= 0
+
+    def priority(self, item: int) -> int:
+        """
+        Get the priority of an item that is in the queue.
+        """
+        return self.prio[item]
+
+    def min_priority(self) -> int:
+        """
+        Get the lowest priority in the queue (it must not be empty). Stale copies met on the way are dropped.
+        """
+        buckets, prio = self.buckets, self.prio
+        current = self.current
+        while True:
+            bucket = buckets[current]
+            while bucket and prio[bucket[-1]] != current:
+                bucket.pop()
+            if bucket:
+                self.current = current
+                return current
+            current += 1
+
+    def push(self, item: int, priority: int) -> bool:
+        """
+        Insert the item, or lower its priority if it is already in the queue.
+        Args:
+            item (int): The cell index.
+            priority (int): The priority, a non-negative integer. Lower comes out first.
+        Returns:
+            bool: True if the queue changed, False if the item was already in with a lower or equal priority.
+        """
+        old = self.prio[item]
+        if old >= 0:
+            if priority >= old:
+                return False
+        else:
+            self.count += 1
+        self.prio[item] = priority
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+        buckets[priority].append(item)
+        if priority < self.current:
+            self.current = priority
+        return True
+
+    def pop(self) -> tuple[int, int]:
+        """
+        Remove an item with the lowest priority.
+        Returns:
+            tuple[int, int]: The item and its priority.
+        """
+        buckets, prio = self.buckets, self.prio
+        current = self.current
+        while True:
+            bucket = buckets[current]
+            while bucket:
+                item = bucket.pop()
+                if prio[item] == current:
+                    prio[item] = -1
+                    self.count -= 1
+                    self.current = current
+                    return item, current
+            current += 1
+
+
+def make_frontier(size: int, sample_priority, allocate: callable = None) -> "IndexedHeap | BucketQueue":
+    """
+    Pick the open list for a search: a BucketQueue when the priorities are integers (unit costs with
+    the Manhattan heuristic), an IndexedHeap otherwise (e.g. the Euclidean heuristic or weighted costs).
+    Args:
+        size (int): Number of cells in the grid.
+        sample_priority: A priority the search will push, e.g. the one of the start node.
+        allocate (callable, optional): Builds the per-cell table of the open list, see IndexedHeap.
+    Returns:
+        IndexedHeap | BucketQueue: An empty open list.
+    """
+    if isinstance(sample_priority, int) and sample_priority >= 0:
+        return BucketQueue(size, allocate)
+    return IndexedHeap(size, allocate)
@@ -1,7 +1,10 @@
 from utils import *
 from spot import Spot
+from terrain import TerrainCosts
+from renderer import Renderer
+from field_cache import FieldCache
 
-class Grid:
+class Grid(TerrainCosts):
     def __init__(self, win: pygame.Surface, rows: int, cols: int, width: int, height: int):
         """
         Initialize a grid with the given number of rows and columns, of the width and height of the window.
@@ -17,7 +20,18 @@ class Grid:
         self.cols: int = cols
         self.width: int = width
         self.height: int = height
+        self.dirty: set[Spot] = set()        # spots whose state changed since the last frame, see renderer.py
+        self.renderer = None                  # created by the first draw
+        self.hooks: list = []                 # told about every state change and expansion, see stats.py
         self.grid: list[list[Spot]] = self._make_grid()
+        self.cells: list[Spot] = [spot for row in self.grid for spot in row]  # the same spots, by row*cols+col
+        self.offsets: list[tuple[int, ...]] = self._make_offsets()
+        self.costs: bytearray | None = None  # traversal cost layer, see terrain.py
+        self.jump_table = None                # built on demand by jps.jump_table
+        self.version: int = 0                 # bumped whenever the barriers or costs change
+        self.field_cache = FieldCache()       # distance fields of the goals queried often, see field_cache.py
+        # the neighbor lists are built once here, then kept up to date by barrier_changed
+        self.update_all_neighbors()
 
     def _make_grid(self) -> list[list[Spot]]:
         """
@@ -26,44 +40,108 @@ class Grid:
             list[list[Spot]]: A 2D list (matrix) representing the grid of Spot objects.
         """
         grid = []
-        spot_width = self.width // self.rows  # width of each spot
-        spot_height = self.height // self.cols  # height of each spot
+        spot_width = self.width // self.cols  # width of each spot
+        spot_height = self.height // self.rows  # height of each spot
         for i in range(self.rows):
             grid.append([])
             for j in range(self.cols):
-                spot = Spot(i, j, spot_width, spot_height, self.rows)
+                spot = Spot(i, j, spot_width, spot_height, self.rows, self, self.cols)
                 grid[i].append(spot)
         return grid
 
-    def draw_grid_lines(self) -> None:
+    def _make_offsets(self) -> list[tuple[int, ...]]:
+        """
+        Precompute, for every flat index, the offsets to the cells next to it that are inside the grid,
+        in the order down, up, right, left. Only the border cells lose some, so the cells of a row
+        share at most three tuples.
+        Returns:
+            list[tuple[int, ...]]: The offsets of every cell, indexed by row*cols+col.
+        """
+        rows, cols = self.rows, self.cols
+        offsets = []
+        for i in range(rows):
+            vertical = ((cols,) if i < rows - 1 else ()) + ((-cols,) if i > 0 else ())
+            if cols == 1:
+                offsets.append(vertical)
+                continue
+            offsets.append(vertical + (1,))
+            offsets.extend([vertical + (1, -1)] * (cols - 2))
+            offsets.append(vertical + (-1,))
+        return offsets
+
+    def index(self, row: int, col: int) -> int:
+        """
+        Get the flat index (row*cols+col) of the spot at (row, col), as used by the open lists.
+        """
+        return row * self.cols + col
+
+    def spot_at(self, idx: int) -> Spot:
+        """
+        Get the spot with the given flat index.
+        """
+        return self.cells[idx]
+
+    def barrier_mask(self) -> bytes:
+        """
+        Get the barriers of the grid as a flat mask, indexed by row*cols+col.
+        Returns:
+            bytes: 1 for every barrier, 0 for every other spot.
+        """
+        return bytes(1 if spot.is_barrier() else 0 for spot in self.cells)
+
+    def update_all_neighbors(self) -> None:
+        """
+        Rebuild the neighbor list of every spot in the grid.
+        Returns:
+            None
+        """
+        for spot in self.cells:
+            spot.update_neighbors(self.grid)
+
+    def barrier_changed(self, spot: Spot) -> None:
+        """
+        Called by a spot when it becomes (or stops being) a barrier.
+        Only the spots next to it can gain or lose a neighbor, so only their lists are rebuilt.
+        Args:
+            spot (Spot): The spot whose barrier flag changed.
+        Returns:
+            None
+        """
+        self.jump_table = None  # the precomputed jumps are stale now
+        self.version += 1       # and so are the cached distance fields
+        idx = spot.index
+        for offset in self.offsets[idx]:
+            self.cells[idx + offset].update_neighbors(self.grid)
+
+    def draw_grid_lines(self, surface: pygame.Surface = None) -> None:
         """
         Draw the grid lines on the Pygame window.
+        Args:
+            surface (pygame.Surface, optional): Where to draw the lines instead of the window.
         Returns:
             None
         """
-        spot_width = self.width // self.rows  # gap between lines
-        spot_height = self.height // self.cols  # gap between lines
+        if surface is None:
+            surface = self.win
+        spot_width = self.width // self.cols  # gap between lines
+        spot_height = self.height // self.rows  # gap between lines
         for i in range(self.rows):
             # draw horizontal lines
-            pygame.draw.line(self.win, COLORS['GREY'], (0, i * spot_height), (self.width, i * spot_height))
+            pygame.draw.line(surface, COLORS['GREY'], (0, i * spot_height), (self.width, i * spot_height))
         for j in range(self.cols):
             # draw vertical lines
-            pygame.draw.line(self.win, COLORS['GREY'], (j * spot_width, 0), (j * spot_width, self.height))
+            pygame.draw.line(surface, COLORS['GREY'], (j * spot_width, 0), (j * spot_width, self.height))
 
     def draw(self) -> None:
         """
-        Draw the entire grid and its spots on the Pygame window.
+        Draw the grid and its spots on the Pygame window.
+        Only the spots that changed since the last call are drawn again (see renderer.py).
         Returns:
             None
         """
-        self.win.fill(COLORS['WHITE'])  # fill the window with white color
-
-        for row in self.grid:
-            for spot in row:
-                spot.draw(self.win)   # draw each spot
-
-        self.draw_grid_lines()        # draw the grid lines          
-        pygame.display.update()       # update the display
+        if self.renderer is None:
+            self.renderer = Renderer(self.win, self)
+        self.renderer.draw()
 
     def get_clicked_pos(self, pos: tuple[int, int]) -> tuple[int, int]:
         """
@@ -78,8 +156,23 @@ class Grid:
         x, y = pos
         col = x // spot_width
         row = y // spot_height
-        return col, row
+        return row, col
     
+    def clear_search(self) -> None:
+        """
+        Remove the marks of a search (open, closed, path), keeping the barriers, start and end.
+        Returns:
+            None
+        """
+        for row in self.grid:
+            for spot in row:
+                if spot.is_start():
+                    spot.make_start()
+                elif spot.is_end():
+                    spot.make_end()
+                elif not spot.is_barrier():
+                    spot.reset()
+
     def reset(self) -> None:
         """
         Reset the grid to its initial state.
@@ -88,4 +181,5 @@ class Grid:
         """
         for row in self.grid:
             for spot in row:
-                spot.reset()
\ No newline at end of file
+                spot.reset()
+        self.clear_costs()
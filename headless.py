@@ -0,0 +1,713 @@
+from array import array
+from collections import deque
+from frontier import IndexedHeap, BucketQueue, make_frontier
+from jps import jump_table, directions, expand_path
+from field_cache import UNREACHED, descend
+from heuristics import h_manhattan_distance, h_euclidian_distance
+
+# The functions in this module run the same algorithms as searching_algorithms.py,
+# but they never draw, never poll pygame events and never sleep.
+# They don't touch the colors of the spots either, they only read which spots are barriers.
+# Cells are addressed by their flat index (row*cols+col), which is a lot cheaper to hash
+# and store than Spot objects. The per-search bookkeeping lives in flat arrays too
+# (bytearray for flags, array('i') for parents, array('d') for costs), so a search costs a
+# few bytes per cell on top of the map.
+
+
+class SearchResult:
+    def __init__(self, found: bool, path: list[tuple[int, int]], cost: float, expanded: int, max_frontier: int=0):
+        """
+        The outcome of a headless search, as plain data.
+        Args:
+            found (bool): True if a path from start to end was found.
+            path (list[tuple[int, int]]): The (row, col) positions from start to end (both included), empty if not found.
+            cost (float): The cost of the path (number of moves, or the sum of the traversal costs
+                of the cells entered when the grid has a cost layer), inf if not found.
+            expanded (int): How many nodes were expanded during the search.
+            max_frontier (int): The largest size the open list (queue, stack, heap) reached during the search.
+        """
+        self.found: bool = found
+        self.path: list[tuple[int, int]] = path
+        self.cost: float = cost
+        self.expanded: int = expanded
+        self.max_frontier: int = max_frontier
+
+    def __repr__(self) -> str:
+        return f"SearchResult(found={self.found}, cost={self.cost}, expanded={self.expanded}, max_frontier={self.max_frontier}, path_len={len(self.path)})"
+
+
+def _position(spot) -> tuple[int, int]:
+    """
+    Accept either a Spot or a (row, col) tuple.
+    """
+    if isinstance(spot, tuple):
+        return spot
+    return spot.get_position()
+
+
+def _layout(grid) -> tuple[int, int, bytes]:
+    """
+    Read the barriers of the grid into a flat mask (1 = barrier).
+    Returns:
+        tuple[int, int, bytes]: rows, cols and the barrier mask.
+    """
+    return grid.rows, grid.cols, grid.barrier_mask()
+
+
+def _prepare(grid, start, end) -> tuple[int, int, bytes, bytearray, int, int]:
+    """
+    Returns:
+        tuple: rows, cols, the barrier mask, the cost layer (None when every move costs 1),
+            and the flat indices of start and end.
+    """
+    rows, cols, walls=_layout(grid)
+    costs=getattr(grid, "costs", None)
+    start_row, start_col=_position(start)
+    end_row, end_col=_position(end)
+    return rows, cols, walls, costs, start_row*cols+start_col, end_row*cols+end_col
+
+
+def _new(walls, n: int, typecode: str, fill=0):
+    """
+    The per-search bookkeeping, one value per cell: a flat array (a bytearray for flags), or,
+    when the barrier mask comes from a SparseGrid, a tiled array that only allocates what the search touches.
+    """
+    allocate=getattr(walls, "allocate", None)
+    if allocate is not None:
+        return allocate(typecode, fill)
+    if typecode=="B" and fill==0:
+        return bytearray(n)
+    return array(typecode, [fill])*n
+
+
+def _require_dense(grid, name: str) -> None:
+    """
+    Reject a SparseGrid (or its barrier mask) in the searches that build tables over the whole map:
+    on the maps it is meant for, those tables could not be allocated.
+    """
+    if getattr(grid, "allocate", None) is not None:
+        raise TypeError(f"{name} builds tables over the whole map and does not run on a SparseGrid, use a CompactGrid")
+
+
+def _frontier(walls, n: int, sample_priority) -> "IndexedHeap | BucketQueue":
+    """
+    An open list for the search (see frontier.make_frontier), tiled like _new on a SparseGrid.
+    """
+    return make_frontier(n, sample_priority, getattr(walls, "allocate", None))
+
+
+def _neighbors(idx: int, rows: int, cols: int, walls: bytearray) -> list[int]:
+    """
+    Same order as Spot.update_neighbors: down, up, right, left.
+    """
+    row, col=divmod(idx, cols)
+    result=[]
+    # DOWN
+    if row<rows-1 and not walls[idx+cols]:
+        result.append(idx+cols)
+    # UP
+    if row>0 and not walls[idx-cols]:
+        result.append(idx-cols)
+    # RIGHT
+    if col<cols-1 and not walls[idx+1]:
+        result.append(idx+1)
+    # LEFT
+    if col>0 and not walls[idx-1]:
+        result.append(idx-1)
+    return result
+
+
+def _found(came_from: array, end: int, cols: int, expanded: int, cost: float=None, costs: bytearray=None, max_frontier: int=0) -> SearchResult:
+    """
+    Walk came_from back from end. When no cost is given, it is added up along the path
+    (the number of moves when there is no cost layer).
+    """
+    path=[]
+    current=end
+    while current!=-1:
+        path.append(divmod(current, cols))
+        current=came_from[current]
+    path.reverse()
+    if cost is None:
+        cost=_path_cost(path, cols, costs)
+    return SearchResult(True, path, cost, expanded, max_frontier)
+
+
+def _path_cost(path: list[tuple[int, int]], cols: int, costs: bytearray) -> float:
+    if costs is None:
+        return len(path)-1
+    return sum(costs[row*cols+col] for row, col in path[1:])
+
+
+def _not_found(expanded: int, max_frontier: int=0) -> SearchResult:
+    return SearchResult(False, [], float("inf"), expanded, max_frontier)
+
+
+def _trivial(start: int, cols: int) -> SearchResult:
+    return SearchResult(True, [divmod(start, cols)], 0, 0)
+
+
+def _wavefront(rows: int, cols: int, walls: bytes, costs: bytearray, start: int, end: int) -> SearchResult:
+    """
+    Unit-cost search done with the NumPy flood fill of wavefront.py: whole waves are expanded at once,
+    and the path is read back from the parent directions. expanded counts the cells the fill reached.
+    """
+    from wavefront import distance_field   # NumPy is only needed for this mode
+
+    _require_dense(walls, "the vectorized mode")
+    field=distance_field(rows, cols, walls, start, end)
+    path=field.path_to(end)
+    if not path:
+        return _not_found(field.reached(), field.max_wave)
+    path=[divmod(idx, cols) for idx in path]
+    return SearchResult(True, path, _path_cost(path, cols, costs), field.reached(), field.max_wave)
+
+
+def bfs(grid, start, end, vectorized: bool=False) -> SearchResult:
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+    if vectorized:
+        return _wavefront(rows, cols, walls, costs, start, end)
+
+    came_from=_new(walls, rows*cols, "i", -1)
+    visited=_new(walls, rows*cols, "B")
+    visited[start]=1
+    queue=deque([start])
+    expanded=0
+    max_frontier=0
+
+    while queue:
+        if len(queue)>max_frontier:
+            max_frontier=len(queue)
+        current=queue.popleft()
+        expanded+=1
+
+        if current==end:
+            return _found(came_from, end, cols, expanded, costs=costs, max_frontier=max_frontier)
+
+        for neighbor in _neighbors(current, rows, cols, walls):
+            if not visited[neighbor]:
+                visited[neighbor]=1
+                came_from[neighbor]=current
+                queue.append(neighbor)
+
+    return _not_found(expanded, max_frontier)
+
+
+def dfs(grid, start, end) -> SearchResult:
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+
+    came_from=_new(walls, rows*cols, "i", -1)
+    visited=_new(walls, rows*cols, "B")
+    visited[start]=1
+    stack=[start]
+    expanded=0
+    max_frontier=0
+
+    while stack:
+        if len(stack)>max_frontier:
+            max_frontier=len(stack)
+        current=stack.pop()
+        expanded+=1
+
+        if current==end:
+            return _found(came_from, end, cols, expanded, costs=costs, max_frontier=max_frontier)
+
+        for neighbor in _neighbors(current, rows, cols, walls):
+            if not visited[neighbor]:
+                visited[neighbor]=1
+                came_from[neighbor]=current
+                stack.append(neighbor)
+
+    return _not_found(expanded, max_frontier)
+
+
+def astar(grid, start, end, heuristic=h_manhattan_distance) -> SearchResult:
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+
+    goal=divmod(end, cols)
+    came_from=_new(walls, rows*cols, "i", -1)
+    g_score=_new(walls, rows*cols, "d", float("inf"))
+    g_score[start]=0
+    closed=_new(walls, rows*cols, "B")
+    # ties on f are broken by the smaller h (i.e. the deeper node), otherwise on open maps
+    # every cell inside the f bound gets expanded before the goal.
+    # A bucket queue keys on f alone and gets the same tie-break from its LIFO buckets.
+    h=heuristic(divmod(start, cols), goal)
+    open_set=_frontier(walls, rows*cols, h)
+    bucketed=isinstance(open_set, BucketQueue)
+    open_set.push(start, h if bucketed else (h, h))
+    expanded=0
+    max_frontier=0
+
+    while open_set:
+        if len(open_set)>max_frontier:
+            max_frontier=len(open_set)
+        current, _=open_set.pop()
+        closed[current]=1
+        expanded+=1
+
+        if current==end:
+            return _found(came_from, end, cols, expanded, g_score[end], max_frontier=max_frontier)
+
+        for neighbor in _neighbors(current, rows, cols, walls):
+            temp_g_score=g_score[current]+1 if costs is None else g_score[current]+costs[neighbor]
+            if temp_g_score<g_score[neighbor]:
+                came_from[neighbor]=current
+                g_score[neighbor]=temp_g_score
+                if not closed[neighbor]:
+                    h=heuristic(divmod(neighbor, cols), goal)
+                    open_set.push(neighbor, int(temp_g_score)+h if bucketed else (temp_g_score+h, h))
+
+    return _not_found(expanded, max_frontier)
+
+
+def jps(grid, start, end) -> SearchResult:
+    """
+    A* over jump points (see jps.py). Same optimal cost as astar, with far fewer expansions on open maps.
+    Jump Point Search needs every move to cost the same, so on a grid with a cost layer this is plain astar.
+    """
+    _require_dense(grid, "jps")
+    if getattr(grid, "costs", None) is not None:
+        return astar(grid, start, end)
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+
+    table=jump_table(grid, rows, cols, walls)
+    goal=divmod(end, cols)
+    came_from=_new(walls, rows*cols, "i", -1)
+    g_score=_new(walls, rows*cols, "i", -1)  # -1 = not reached yet
+    g_score[start]=0
+    closed=_new(walls, rows*cols, "B")
+    open_set=_frontier(walls, rows*cols, 0)
+    open_set.push(start, h_manhattan_distance(divmod(start, cols), goal))
+    expanded=0
+    max_frontier=0
+
+    while open_set:
+        if len(open_set)>max_frontier:
+            max_frontier=len(open_set)
+        current, _=open_set.pop()
+        closed[current]=1
+        expanded+=1
+
+        if current==end:
+            jump_points=[]
+            node=end
+            while node!=-1:
+                jump_points.append(node)
+                node=came_from[node]
+            jump_points.reverse()
+            path=[divmod(idx, cols) for idx in expand_path(jump_points, cols)]
+            return SearchResult(True, path, g_score[end], expanded, max_frontier)
+
+        for direction in directions(current, came_from[current], cols):
+            neighbor, distance=table.jump(current, direction, end)
+            if neighbor<0 or closed[neighbor]:
+                continue
+            temp_g_score=g_score[current]+distance
+            if g_score[neighbor]<0 or temp_g_score<g_score[neighbor]:
+                came_from[neighbor]=current
+                g_score[neighbor]=temp_g_score
+                open_set.push(neighbor, temp_g_score+h_manhattan_distance(divmod(neighbor, cols), goal))
+
+    return _not_found(expanded, max_frontier)
+
+
+def _stitched(forward: array, backward: array, u: int, v: int, cols: int, expanded: int, costs: bytearray, cost: float=None,
+              max_frontier: int=0) -> SearchResult:
+    """
+    Join the two half-trees of a bidirectional search: start..u from the forward tree, then v..end
+    from the backward tree (u==v when the searches met on a cell, u->v when they met on an edge).
+    """
+    path=[]
+    current=u
+    while current!=-1:
+        path.append(divmod(current, cols))
+        current=forward[current]
+    path.reverse()
+    current=v if v!=u else backward[u]
+    while current!=-1:
+        path.append(divmod(current, cols))
+        current=backward[current]
+    if cost is None:
+        cost=_path_cost(path, cols, costs)
+    return SearchResult(True, path, cost, expanded, max_frontier)
+
+
+def bidirectional_bfs(grid, start, end) -> SearchResult:
+    """
+    BFS from both ends at once, one whole layer at a time, always growing the smaller frontier.
+    The first layer that reaches a cell already seen by the other side gives a shortest path
+    (in number of moves).
+    """
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+
+    came_from=(_new(walls, rows*cols, "i", -1), _new(walls, rows*cols, "i", -1))
+    seen=(_new(walls, rows*cols, "B"), _new(walls, rows*cols, "B"))
+    seen[0][start]=1
+    seen[1][end]=1
+    frontiers=[[start], [end]]
+    expanded=0
+    max_frontier=0
+
+    while frontiers[0] and frontiers[1]:
+        if len(frontiers[0])+len(frontiers[1])>max_frontier:
+            max_frontier=len(frontiers[0])+len(frontiers[1])
+        side=0 if len(frontiers[0])<=len(frontiers[1]) else 1
+        mine, other, parents=seen[side], seen[1-side], came_from[side]
+        next_layer=[]
+        for current in frontiers[side]:
+            expanded+=1
+            for neighbor in _neighbors(current, rows, cols, walls):
+                if mine[neighbor]:
+                    continue
+                mine[neighbor]=1
+                parents[neighbor]=current
+                if other[neighbor]:
+                    return _stitched(came_from[0], came_from[1], neighbor, neighbor, cols, expanded, costs, max_frontier=max_frontier)
+                next_layer.append(neighbor)
+        frontiers[side]=next_layer
+
+    return _not_found(expanded, max_frontier)
+
+
+def bidirectional_astar(grid, start, end) -> SearchResult:
+    """
+    A* from both ends at once (forward towards end, backward towards start), expanding the side with
+    the smaller open list. Every time one side reaches a cell the other side has a g-score for, the
+    searches meet and the best meeting cost mu is kept. The search stops once the smallest f of
+    either open list is >= mu: with a consistent heuristic no cheaper path can be left.
+    """
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+
+    targets=(divmod(end, cols), divmod(start, cols))
+    came_from=(_new(walls, rows*cols, "i", -1), _new(walls, rows*cols, "i", -1))
+    g_score=(_new(walls, rows*cols, "d", float("inf")), _new(walls, rows*cols, "d", float("inf")))
+    closed=(_new(walls, rows*cols, "B"), _new(walls, rows*cols, "B"))
+    g_score[0][start]=0
+    g_score[1][end]=0
+    h=h_manhattan_distance(targets[1], targets[0])
+    open_sets=(_frontier(walls, rows*cols, h), _frontier(walls, rows*cols, h))
+    bucketed=isinstance(open_sets[0], BucketQueue)
+    open_sets[0].push(start, h)
+    open_sets[1].push(end, h)
+    best=float("inf")
+    meeting=None
+    expanded=0
+    max_frontier=0
+
+    while open_sets[0] and open_sets[1]:
+        if len(open_sets[0])+len(open_sets[1])>max_frontier:
+            max_frontier=len(open_sets[0])+len(open_sets[1])
+        if best<=max(open_sets[0].min_priority(), open_sets[1].min_priority()):
+            break
+        side=0 if len(open_sets[0])<=len(open_sets[1]) else 1
+        mine, other=g_score[side], g_score[1-side]
+        current, _=open_sets[side].pop()
+        closed[side][current]=1
+        expanded+=1
+
+        for neighbor in _neighbors(current, rows, cols, walls):
+            # the forward search pays for entering neighbor, the backward one for entering current
+            if costs is None:
+                step=1
+            else:
+                step=costs[neighbor] if side==0 else costs[current]
+            temp_g_score=mine[current]+step
+            if temp_g_score<mine[neighbor]:
+                mine[neighbor]=temp_g_score
+                came_from[side][neighbor]=current
+                if not closed[side][neighbor]:
+                    f_score=temp_g_score+h_manhattan_distance(divmod(neighbor, cols), targets[side])
+                    open_sets[side].push(neighbor, int(f_score) if bucketed else f_score)
+            if temp_g_score+other[neighbor]<best:
+                best=temp_g_score+other[neighbor]
+                meeting=(current, neighbor) if side==0 else (neighbor, current)
+
+    if meeting is None:
+        return _not_found(expanded, max_frontier)
+    return _stitched(came_from[0], came_from[1], meeting[0], meeting[1], cols, expanded, costs, best, max_frontier=max_frontier)
+
+
+def ucs(grid, start, end, vectorized: bool=False) -> SearchResult:
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+    # with unit costs, UCS settles the cells in the same order as BFS waves
+    if vectorized and costs is None:
+        return _wavefront(rows, cols, walls, costs, start, end)
+
+    came_from=_new(walls, rows*cols, "i", -1)
+    cost=_new(walls, rows*cols, "d", float("inf"))
+    cost[start]=0
+    visited=_new(walls, rows*cols, "B")
+    pq=_frontier(walls, rows*cols, 0)
+    pq.push(start, 0)
+    expanded=0
+    max_frontier=0
+
+    while pq:
+        if len(pq)>max_frontier:
+            max_frontier=len(pq)
+        current, current_cost=pq.pop()
+        visited[current]=1
+        expanded+=1
+
+        if current==end:
+            return _found(came_from, end, cols, expanded, current_cost, max_frontier=max_frontier)
+
+        for neighbor in _neighbors(current, rows, cols, walls):
+            new_cost=current_cost+1 if costs is None else current_cost+costs[neighbor]
+            if new_cost<cost[neighbor] and not visited[neighbor]:
+                cost[neighbor]=new_cost
+                came_from[neighbor]=current
+                pq.push(neighbor, new_cost)
+
+    return _not_found(expanded, max_frontier)
+
+
+def greedy(grid, start, end, heuristic=h_euclidian_distance) -> SearchResult:
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+
+    goal=divmod(end, cols)
+    came_from=_new(walls, rows*cols, "i", -1)
+    visited=_new(walls, rows*cols, "B")
+    visited[start]=1
+    priority=heuristic(divmod(start, cols), goal)
+    pq=_frontier(walls, rows*cols, priority)
+    pq.push(start, priority)
+    expanded=0
+    max_frontier=0
+
+    while pq:
+        if len(pq)>max_frontier:
+            max_frontier=len(pq)
+        current, _=pq.pop()
+        expanded+=1
+
+        if current==end:
+            return _found(came_from, end, cols, expanded, costs=costs, max_frontier=max_frontier)
+
+        for neighbor in _neighbors(current, rows, cols, walls):
+            if not visited[neighbor]:
+                visited[neighbor]=1
+                came_from[neighbor]=current
+                pq.push(neighbor, heuristic(divmod(neighbor, cols), goal))
+
+    return _not_found(expanded, max_frontier)
+
+
+def cached_path(grid, start, end) -> SearchResult:
+    """
+    Answer a query from the reverse distance field of end kept in grid.field_cache (see field_cache.py).
+    The first query to a goal computes its field; the next ones, while the map does not change,
+    only walk down the field, in O(path length). expanded is 0 when the field was cached.
+    """
+    _require_dense(grid, "cached_path")
+    rows, cols=grid.rows, grid.cols
+    start_row, start_col=_position(start)
+    end_row, end_col=_position(end)
+    start, end=start_row*cols+start_col, end_row*cols+end_col
+    cache=grid.field_cache
+    misses=cache.misses
+    field=cache.field(grid, end)
+    expanded=0 if cache.misses==misses else sum(1 for d in field if d!=UNREACHED)
+    path=descend(field, rows, cols, grid.costs, start)
+    if not path:
+        return _not_found(expanded)
+    return SearchResult(True, [divmod(idx, cols) for idx in path], field[start], expanded)
+
+
+def _depth_limited(rows: int, cols: int, walls: bytearray, costs: bytearray, start: int, end: int, limit: int) -> tuple[SearchResult, bool]:
+    """
+    Depth-first search that does not go deeper than limit. It keeps an explicit stack of
+    (cell, neighbors left to try) frames instead of recursing, so the depth is not bounded by
+    Python's recursion limit. The neighbors are stored reversed and popped from the end,
+    which visits them in the same order as the recursive version.
+    Returns:
+        tuple[SearchResult, bool]: The result, and whether the limit cut anything off: a cell left
+            unexpanded at the limit with a neighbor that was never reached. When nothing was, every cell
+            that can be reached from start was, and a deeper limit cannot find anything more.
+    """
+    came_from=_new(walls, rows*cols, "i", -1)
+    seen=_new(walls, rows*cols, "B")
+    seen[start]=1
+    expanded=1
+
+    if start==end:
+        return _found(came_from, end, cols, expanded, costs=costs), False
+
+    stack=[(start, _neighbors(start, rows, cols, walls)[::-1] if limit>0 else [])]
+    held=[] if limit>0 else [start]   # the cells reached at the limit, left unexpanded
+    max_frontier=1
+
+    while stack:
+        if len(stack)>max_frontier:
+            max_frontier=len(stack)
+        current, pending=stack[-1]
+        if not pending:
+            stack.pop()
+            continue
+
+        neighbor=pending.pop()
+        if seen[neighbor]:
+            continue
+        seen[neighbor]=1
+        came_from[neighbor]=current
+        expanded+=1
+
+        if neighbor==end:
+            return _found(came_from, end, cols, expanded, costs=costs, max_frontier=max_frontier), True
+
+        # len(stack) is the depth of neighbor
+        if len(stack)<limit:
+            stack.append((neighbor, _neighbors(neighbor, rows, cols, walls)[::-1]))
+        else:
+            held.append(neighbor)
+
+    cutoff=any(not seen[other] for idx in held for other in _neighbors(idx, rows, cols, walls))
+    return _not_found(expanded, max_frontier), cutoff
+
+
+def dls(grid, start, end, limit: int=50) -> SearchResult:
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    return _depth_limited(rows, cols, walls, costs, start, end, limit)[0]
+
+
+def iddfs(grid, start, end, max_depth: int=None) -> SearchResult:
+    """
+    Iterative deepening. Without max_depth the depth goes up to the number of cells, so any reachable end is found.
+    It stops as soon as a pass was not cut off by its depth limit (see _depth_limited): every cell that can
+    be reached was, so deeper passes would only repeat it.
+    """
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    expanded=0
+    max_frontier=0
+    if max_depth is None:
+        max_depth=rows*cols-1
+        # a depth-first tree can be about as deep as the map has cells, so the passes only stop being cut
+        # off near that depth: check first, with one unlimited pass, that end can be reached at all.
+        # That pass is only counted when it is the answer, so expanded counts the same passes as iddfs_steps
+        result, _=_depth_limited(rows, cols, walls, costs, start, end, max_depth)
+        if not result.found:
+            return result
+    for depth in range(max_depth+1):
+        result, cutoff=_depth_limited(rows, cols, walls, costs, start, end, depth)
+        expanded+=result.expanded
+        max_frontier=max(max_frontier, result.max_frontier)
+        if result.found:
+            result.expanded=expanded
+            result.max_frontier=max_frontier
+            return result
+        if not cutoff:
+            break
+    return _not_found(expanded, max_frontier)
+
+
+def ida(grid, start, end, heuristic=h_manhattan_distance, max_iterations: int=None, max_bound: float=float("inf")) -> SearchResult:
+    """
+    IDA* with an explicit stack. The current path is a list that grows and shrinks in place, and
+    on_path marks its cells, so checking whether a neighbor is already on the path is O(1) and no
+    path is ever copied while searching.
+    Args:
+        max_iterations (int, optional): Give up after this many bound increases (no limit by default).
+        max_bound (float, optional): Give up when the bound goes above this (no limit by default).
+    Every pass enumerates the paths under its bound again, so when end cannot be reached the passes would
+    only stop once every simple path was tried: one unlimited depth-first pass checks that first, in O(cells).
+    """
+    rows, cols, walls, costs, start, end=_prepare(grid, start, end)
+    if start==end:
+        return _trivial(start, cols)
+
+    # only counted when it is the answer, so expanded counts the same passes as ida_steps
+    reachable, _=_depth_limited(rows, cols, walls, costs, start, end, rows*cols-1)
+    if not reachable.found:
+        return reachable
+
+    goal=divmod(end, cols)
+    expanded=0
+    max_frontier=0   # the longest path the depth-first passes held
+    on_path=_new(walls, rows*cols, "B")
+
+    def search(bound: float) -> tuple[float, list]:
+        """
+        One depth-first pass with the given bound.
+        Returns:
+            tuple[float, list]: The smallest f above the bound (inf if none), and the path if end was reached.
+        """
+        nonlocal expanded, max_frontier
+        expanded+=1
+        f=heuristic(divmod(start, cols), goal)
+        if f>bound:
+            return f, None
+
+        min_bound=float("inf")
+        path=[start]
+        g_stack=[0]
+        pending=[_neighbors(start, rows, cols, walls)[::-1]]
+        on_path[start]=1
+
+        while pending:
+            neighbors=pending[-1]
+            if not neighbors:
+                on_path[path.pop()]=0
+                g_stack.pop()
+                pending.pop()
+                continue
+
+            neighbor=neighbors.pop()
+            if on_path[neighbor]:
+                continue
+
+            expanded+=1
+            g=g_stack[-1]+(1 if costs is None else costs[neighbor])
+            f=g+heuristic(divmod(neighbor, cols), goal)
+            if f>bound:
+                if f<min_bound:
+                    min_bound=f
+                continue
+
+            path.append(neighbor)
+            if len(path)>max_frontier:
+                max_frontier=len(path)
+            if neighbor==end:
+                for idx in path:
+                    on_path[idx]=0
+                return f, path
+
+            on_path[neighbor]=1
+            g_stack.append(g)
+            pending.append(_neighbors(neighbor, rows, cols, walls)[::-1])
+
+        return min_bound, None
+
+    bound=heuristic(divmod(start, cols), goal)
+    iteration=0
+
+    while max_iterations is None or iteration<max_iterations:
+        result, final_path=search(bound)
+
+        if final_path:
+            path=[divmod(idx, cols) for idx in final_path]
+            return SearchResult(True, path, _path_cost(path, cols, costs), expanded, max_frontier)
+
+        if result==float("inf") or result>max_bound:
+            break
+
+        bound=result
+        iteration+=1
+
+    return _not_found(expanded, max_frontier)
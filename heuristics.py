@@ -0,0 +1,13 @@
+import math
+
+
+def h_manhattan_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
+    x1, y1=p1
+    x2, y2=p2
+    return abs(x1-x2)+abs(y1-y2)
+
+
+def h_euclidian_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
+    x1, y1=p1
+    x2, y2=p2
+    return math.sqrt((x1-x2)**2+(y1-y2)**2)
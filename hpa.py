@@ -0,0 +1,338 @@
+import heapq
+from headless import SearchResult, _position, _require_dense
+
+# Hierarchical path-finding (HPA*) on top of the headless grids.
+#
+# The map is cut into square clusters of cluster_size x cluster_size cells. Wherever two neighboring
+# clusters share a run of free cells along their border, the run is an entrance, and one or two
+# transitions are placed in it: pairs of cells facing each other across the border. The cells of the
+# transitions are the nodes of a small abstract graph, with two kinds of edges:
+#   - inter edges, between the two cells of a transition (one move),
+#   - intra edges, between two nodes of the same cluster, weighted by the cost of the cheapest path
+#     between them that stays inside the cluster.
+# A query links start and end to the nodes of their clusters, searches the abstract graph, then refines
+# every abstract edge into cells with a search that never leaves one cluster. Every search is small,
+# but the paths are only near-optimal: they have to go through the transitions.
+#
+# The hierarchy keeps its own copy of the barriers and costs. After changing a cell of the grid,
+# call update(row, col): only the borders of that cell's cluster are scanned again, and only the
+# clusters whose nodes changed (that cluster and at most its four neighbors) get their edges rebuilt.
+
+DEFAULT_CLUSTER_SIZE = 16
+_WIDE_ENTRANCE = 6   # entrances at least this wide get a transition at each end, the others one in the middle
+
+
+class Hierarchy:
+    def __init__(self, grid, cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        """
+        Build the abstract graph of a grid.
+        Args:
+            grid (Grid | CompactGrid): The map. Its barriers and costs are copied.
+            cluster_size (int): The side of the clusters, in cells.
+        """
+        if cluster_size < 2:
+            raise ValueError(f"cluster_size must be at least 2, got {cluster_size}")
+        _require_dense(grid, "Hierarchy")
+        self.grid = grid
+        self.rows: int = grid.rows
+        self.cols: int = grid.cols
+        self.size: int = cluster_size
+        self.cluster_rows: int = -(-self.rows // cluster_size)
+        self.cluster_cols: int = -(-self.cols // cluster_size)
+        self.walls: bytearray = bytearray(grid.barrier_mask())
+        self.costs: bytearray | None = None if grid.costs is None else bytearray(grid.costs)
+        n = self.cluster_rows * self.cluster_cols
+        self.borders: dict[tuple[int, int], list[tuple[int, int]]] = {}   # (cluster, right/lower cluster) -> transitions
+        self.inter: dict[int, dict[int, int]] = {}                        # node -> the nodes across a border -> cost
+        self.nodes: list[set[int]] = [set() for _ in range(n)]           # the nodes of each cluster
+        self.intra: list[dict[int, dict[int, float]]] = [{} for _ in range(n)]   # per cluster: node -> node -> cost
+        self.rebuilt: int = 0   # clusters whose intra edges were computed, for profiling
+
+        for cluster in range(n):
+            for other in self._next_clusters(cluster):
+                self._scan_border(cluster, other)
+        for cluster in range(n):
+            self._build_cluster(cluster)
+
+    # ---- layout ----
+    def cluster_of(self, idx: int) -> int:
+        """
+        Get the cluster of a cell, by flat index.
+        """
+        row, col = divmod(idx, self.cols)
+        return (row // self.size) * self.cluster_cols + col // self.size
+
+    def _bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """
+        The first row, the row after the last, the first column and the column after the last of a cluster.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        row, col = cluster_row * self.size, cluster_col * self.size
+        return row, min(self.rows, row + self.size), col, min(self.cols, col + self.size)
+
+    def _next_clusters(self, cluster: int) -> list[int]:
+        """
+        The clusters to the right of and below a cluster (each border is owned by the cluster before it).
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        result = []
+        if cluster_col < self.cluster_cols - 1:
+            result.append(cluster + 1)
+        if cluster_row < self.cluster_rows - 1:
+            result.append(cluster + self.cluster_cols)
+        return result
+
+    def _cost(self, idx: int) -> int:
+        return 1 if self.costs is None else self.costs[idx]
+
+    # ---- building ----
+    def _scan_border(self, cluster: int, other: int) -> None:
+        """
+        Find the entrances on the border between a cluster and the one to its right (or below it),
+        and replace the transitions of that border.
+        """
+        cols, walls = self.cols, self.walls
+        row0, row1, col0, col1 = self._bounds(cluster)
+        # tested on the cluster below, not on the one to the right: with a single column of clusters
+        # the cluster below is cluster + 1 too
+        if other == cluster + self.cluster_cols:
+            # horizontal border: cells (row1-1, col) over (row1, col)
+            pairs = [((row1 - 1) * cols + col, row1 * cols + col) for col in range(col0, col1)]
+        else:
+            # vertical border: cells (row, col1-1) | (row, col1)
+            pairs = [(row * cols + col1 - 1, row * cols + col1) for row in range(row0, row1)]
+
+        transitions = []
+        run = []
+        for a, b in pairs + [(-1, -1)]:   # the sentinel closes the last run
+            if a >= 0 and not walls[a] and not walls[b]:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) >= _WIDE_ENTRANCE:
+                    transitions += [run[0], run[-1]]
+                else:
+                    transitions.append(run[len(run) // 2])
+                run = []
+
+        for a, b in self.borders.get((cluster, other), ()):
+            self.inter[a].pop(b, None)
+            self.inter[b].pop(a, None)
+        self.borders[(cluster, other)] = transitions
+        for a, b in transitions:
+            self.inter.setdefault(a, {})[b] = self._cost(b)
+            self.inter.setdefault(b, {})[a] = self._cost(a)
+
+    def _cluster_nodes(self, cluster: int) -> set[int]:
+        """
+        The cells of a cluster that are part of a transition, read from its (up to four) borders.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        nodes = set()
+        for key in ((cluster, cluster + 1), (cluster, cluster + self.cluster_cols)):
+            for a, _ in self.borders.get(key, ()):
+                nodes.add(a)
+        if cluster_col > 0:
+            for _, b in self.borders.get((cluster - 1, cluster), ()):
+                nodes.add(b)
+        if cluster_row > 0:
+            for _, b in self.borders.get((cluster - self.cluster_cols, cluster), ()):
+                nodes.add(b)
+        return nodes
+
+    def _build_cluster(self, cluster: int) -> None:
+        """
+        Collect the nodes of a cluster and compute the intra edges between them.
+        """
+        nodes = self._cluster_nodes(cluster)
+        self.nodes[cluster] = nodes
+        edges = {}
+        for node in nodes:
+            dist, _, _ = self._local(node, cluster, nodes - {node})
+            edges[node] = {other: dist[other] for other in nodes if other != node and other in dist}
+        self.intra[cluster] = edges
+        self.rebuilt += 1
+
+    def update(self, row: int, col: int) -> None:
+        """
+        Copy the barrier flag and the cost of one cell from the grid, and rebuild what depends on it.
+        Call it after every change of a barrier or cost of the grid.
+        Args:
+            row (int): The row of the cell that changed.
+            col (int): The column of the cell that changed.
+        Returns:
+            None
+        """
+        idx = row * self.cols + col
+        grid = self.grid
+        self.walls[idx] = self._is_barrier(idx)
+        if grid.costs is not None:
+            if self.costs is None:
+                self.costs = bytearray(b"\x01") * (self.rows * self.cols)
+            self.costs[idx] = grid.costs[idx]
+        elif self.costs is not None:
+            self.costs = None
+            for cluster in range(len(self.nodes)):   # every cost went back to 1
+                for other in self._next_clusters(cluster):
+                    self._scan_border(cluster, other)
+                self._build_cluster(cluster)
+            return
+
+        cluster = self.cluster_of(idx)
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        around = [cluster]
+        if cluster_col > 0:
+            around.append(cluster - 1)
+        if cluster_row > 0:
+            around.append(cluster - self.cluster_cols)
+        around += self._next_clusters(cluster)
+        # the borders of the cluster; only a cell on one of them can move an entrance, but the
+        # cost of the inter edges is read from the cells too, so they are all scanned again
+        for other in around[1:]:
+            if other < cluster:
+                self._scan_border(other, cluster)
+            else:
+                self._scan_border(cluster, other)
+        self._build_cluster(cluster)
+        for other in around[1:]:
+            if self._cluster_nodes(other) != self.nodes[other]:
+                self._build_cluster(other)
+
+    def _is_barrier(self, idx: int) -> int:
+        """
+        Read one barrier flag of the grid without building its whole mask.
+        """
+        grid = self.grid
+        if isinstance(grid.cells, bytearray):   # CompactGrid
+            return grid.cells[idx] & 1
+        return 1 if grid.cells[idx].is_barrier() else 0   # Grid: a list of spots
+
+    # ---- searching ----
+    def _local(self, source: int, cluster: int, targets: set[int], reverse: bool = False) -> tuple[dict, dict, int]:
+        """
+        Dijkstra from source that never leaves the cluster, until every target is settled.
+        Args:
+            source (int): The flat index to start from.
+            cluster (int): The cluster to stay in.
+            targets (set[int]): The cells whose distance is needed.
+            reverse (bool): Compute the cost of reaching source from the cells instead of the other way round.
+        Returns:
+            tuple[dict, dict, int]: The distances and the parents of the settled cells, and how many were expanded.
+        """
+        cols, walls = self.cols, self.walls
+        row0, row1, col0, col1 = self._bounds(cluster)
+        dist = {source: 0}
+        parent = {source: -1}
+        done = set()
+        left = len(targets)
+        heap = [(0, source)]
+        expanded = 0
+        while heap and left:
+            d, current = heapq.heappop(heap)
+            if current in done:
+                continue
+            done.add(current)
+            expanded += 1
+            if current in targets:
+                left -= 1
+            row, col = divmod(current, cols)
+            step = self._cost(current) if reverse else 0
+            for nxt, inside in ((current + cols, row < row1 - 1), (current - cols, row > row0),
+                                (current + 1, col < col1 - 1), (current - 1, col > col0)):
+                if not inside or walls[nxt] or nxt in done:
+                    continue
+                nd = d + (step if reverse else self._cost(nxt))
+                if nd < dist.get(nxt, float("inf")):
+                    dist[nxt] = nd
+                    parent[nxt] = current
+                    heapq.heappush(heap, (nd, nxt))
+        return {cell: dist[cell] for cell in done}, parent, expanded
+
+    def _refine(self, a: int, b: int) -> tuple[list[int], int]:
+        """
+        Turn one abstract edge into cells (b included, a not).
+        """
+        if self.cluster_of(a) != self.cluster_of(b):
+            return [b], 0   # an inter edge: the two cells of a transition
+        _, parent, expanded = self._local(a, self.cluster_of(a), {b})
+        cells = []
+        current = b
+        while current != a:
+            cells.append(current)
+            current = parent[current]
+        cells.reverse()
+        return cells, expanded
+
+    def find_path(self, start, end) -> SearchResult:
+        """
+        Plan a path on the abstract graph, then refine it into cells.
+        Args:
+            start (Spot | tuple[int, int]): Where the path starts.
+            end (Spot | tuple[int, int]): Where it ends.
+        Returns:
+            SearchResult: The path and its cost (near-optimal, see the top of the module). expanded counts the
+                cells expanded by the local searches plus the nodes expanded on the abstract graph.
+        """
+        cols = self.cols
+        start_row, start_col = _position(start)
+        end_row, end_col = _position(end)
+        start, end = start_row * cols + start_col, end_row * cols + end_col
+        if self.walls[start] or self.walls[end]:
+            return SearchResult(False, [], float("inf"), 0)
+        if start == end:
+            return SearchResult(True, [divmod(start, cols)], 0, 0)
+
+        # link start and end to the nodes of their clusters (and to each other if they share one)
+        start_cluster, end_cluster = self.cluster_of(start), self.cluster_of(end)
+        targets = set(self.nodes[start_cluster])
+        if start_cluster == end_cluster:
+            targets.add(end)
+        dist, _, expanded = self._local(start, start_cluster, targets)
+        from_start = {node: d for node, d in dist.items() if node in targets and node != start}
+        dist, _, more = self._local(end, end_cluster, self.nodes[end_cluster], reverse=True)
+        expanded += more
+        to_end = {node: d for node, d in dist.items() if node in self.nodes[end_cluster] and node != end}
+
+        # A* on the abstract graph
+        end_row, end_col = divmod(end, cols)
+        h = lambda node: abs(node // cols - end_row) + abs(node % cols - end_col)
+        g = {start: 0}
+        parent = {start: -1}
+        closed = set()
+        heap = [(h(start), start)]
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            expanded += 1
+            if node == end:
+                break
+            if node == start:
+                edges = list(from_start.items())
+            else:
+                edges = list(self.intra[self.cluster_of(node)].get(node, {}).items())
+                if node in to_end:
+                    edges.append((end, to_end[node]))
+            edges += self.inter.get(node, {}).items()
+            for nxt, cost in edges:
+                ng = g[node] + cost
+                if nxt not in closed and ng < g.get(nxt, float("inf")):
+                    g[nxt] = ng
+                    parent[nxt] = node
+                    heapq.heappush(heap, (ng + h(nxt), nxt))
+        else:
+            return SearchResult(False, [], float("inf"), expanded)
+
+        abstract = []
+        node = end
+        while node != -1:
+            abstract.append(node)
+            node = parent[node]
+        abstract.reverse()
+        cells = [start]
+        for a, b in zip(abstract, abstract[1:]):
+            step, more = self._refine(a, b)
+            cells += step
+            expanded += more
+        return SearchResult(True, [divmod(idx, cols) for idx in cells], g[end], expanded)
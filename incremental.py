@@ -0,0 +1,200 @@
+from array import array
+from frontier import IndexedHeap
+from heuristics import h_manhattan_distance
+from headless import SearchResult, _position, _require_dense
+from compact_grid import BARRIER
+from stats import SearchHook
+
+# Incremental replanning (D* Lite: Koenig and Likhachev, 2002).
+#
+# The search runs backwards, from end, and keeps two estimates per cell: g, the cost to end it settled
+# on, and rhs, the one its neighbors imply right now. A cell is consistent when both agree. When a cell
+# changes (a barrier comes or goes, or its cost changes), only that cell and its neighbors get a new
+# rhs; the next plan() expands just the inconsistent cells that can matter for the path from start,
+# instead of searching the whole map again. The start can move too (an agent walking along the path):
+# the priorities stay valid thanks to the km offset, so nothing is thrown away.
+#
+# The planner keeps its own copy of the barriers and costs. Tell it about changes either by calling
+# update(row, col), or, on a Spot based Grid, by putting it in grid.hooks: Spot.make_barrier and
+# Spot.reset report every barrier change to the hooks (see stats.py). Cost changes always need update().
+
+INF = float("inf")
+
+
+class DStarLite(SearchHook):
+    def __init__(self, grid, start, end, heuristic=h_manhattan_distance):
+        """
+        Set up a planner from start to end. Nothing is searched until plan() is called.
+        Args:
+            grid (Grid | CompactGrid): The map. Its barriers and costs are copied.
+            start (Spot | tuple[int, int]): Where the path starts (it can be moved later, see move_start).
+            end (Spot | tuple[int, int]): Where it ends.
+            heuristic (callable): An admissible heuristic, h(p1, p2) (see heuristics.py).
+        """
+        _require_dense(grid, "DStarLite")
+        self.grid = grid
+        self.rows: int = grid.rows
+        self.cols: int = grid.cols
+        self.walls: bytearray = bytearray(grid.barrier_mask())
+        self.costs: bytearray | None = None if grid.costs is None else bytearray(grid.costs)
+        self.heuristic = heuristic
+        start_row, start_col = _position(start)
+        end_row, end_col = _position(end)
+        self.start: int = start_row * self.cols + start_col
+        self.end: int = end_row * self.cols + end_col
+        self.last: int = self.start   # where the start was when km was last brought up to date
+        self.km: float = 0
+
+        n = self.rows * self.cols
+        self.g: array = array("d", [INF]) * n
+        self.rhs: array = array("d", [INF]) * n
+        self.rhs[self.end] = 0
+        self.queue = IndexedHeap(n)
+        self.queue.push(self.end, self._key(self.end))
+        self.expanded: int = 0   # over every plan() so far
+
+    # ---- map ----
+    def _around(self, idx: int) -> list[int]:
+        """
+        The cells next to a cell, inside the map (barriers included), in the order down, up, right, left.
+        """
+        rows, cols = self.rows, self.cols
+        row, col = divmod(idx, cols)
+        result = []
+        if row < rows - 1:
+            result.append(idx + cols)
+        if row > 0:
+            result.append(idx - cols)
+        if col < cols - 1:
+            result.append(idx + 1)
+        if col > 0:
+            result.append(idx - 1)
+        return result
+
+    def _move_cost(self, a: int, b: int) -> float:
+        """
+        The cost of moving from a into the cell b next to it, inf if either one is a barrier.
+        """
+        if self.walls[a] or self.walls[b]:
+            return INF
+        return 1 if self.costs is None else self.costs[b]
+
+    def _key(self, idx: int) -> tuple[float, float]:
+        m = min(self.g[idx], self.rhs[idx])
+        if m == INF:
+            return INF, INF
+        return m + self.heuristic(divmod(self.start, self.cols), divmod(idx, self.cols)) + self.km, m
+
+    def _update_vertex(self, idx: int) -> None:
+        if idx != self.end:
+            g = self.g
+            best = INF
+            for nxt in self._around(idx):
+                cost = self._move_cost(idx, nxt) + g[nxt]
+                if cost < best:
+                    best = cost
+            self.rhs[idx] = best
+        if self.g[idx] != self.rhs[idx]:
+            self.queue.update(idx, self._key(idx))
+        else:
+            self.queue.remove(idx)
+
+    # ---- changes ----
+    def update(self, row: int, col: int) -> None:
+        """
+        Copy the barrier flag and the cost of one cell from the grid, and mark what it changes.
+        Args:
+            row (int): The row of the cell that changed.
+            col (int): The column of the cell that changed.
+        Returns:
+            None
+        """
+        idx = row * self.cols + col
+        grid = self.grid
+        if isinstance(grid.cells, bytearray):   # CompactGrid
+            barrier = grid.cells[idx] & BARRIER
+        else:                                    # Grid: a list of spots
+            barrier = grid.cells[idx].state & BARRIER
+        cost = 1 if grid.costs is None else grid.costs[idx]
+        if self.costs is None and cost != 1:
+            self.costs = bytearray(b"\x01") * (self.rows * self.cols)
+        if bool(barrier) == bool(self.walls[idx]) and (self.costs is None or self.costs[idx] == cost):
+            return
+        self.walls[idx] = 1 if barrier else 0
+        if self.costs is not None:
+            self.costs[idx] = cost
+        # the moves out of the cell and into it changed: the cell and its neighbors need a new rhs
+        self._update_vertex(idx)
+        for other in self._around(idx):
+            self._update_vertex(other)
+
+    def on_state(self, spot, old: int, new: int) -> None:
+        """
+        As a hook of a Grid: follow the barriers that are set or cleared.
+        """
+        if (old ^ new) & BARRIER:
+            self.update(spot.row, spot.col)
+
+    def move_start(self, start) -> None:
+        """
+        Move the start (e.g. the agent took a step along the path). The next plan() reuses everything.
+        Args:
+            start (Spot | tuple[int, int]): The new start.
+        Returns:
+            None
+        """
+        row, col = _position(start)
+        self.start = row * self.cols + col
+        self.km += self.heuristic(divmod(self.last, self.cols), divmod(self.start, self.cols))
+        self.last = self.start
+
+    # ---- planning ----
+    def plan(self) -> SearchResult:
+        """
+        Bring the search up to date with the changes since the last call, and read the path off it.
+        Returns:
+            SearchResult: The cheapest path from start to end. expanded counts only the cells expanded
+                by this call, i.e. the cost of the repair.
+        """
+        g, rhs, queue = self.g, self.rhs, self.queue
+        start = self.start
+        expanded = 0
+        max_frontier = len(queue)
+        while queue and (queue.min_priority() < self._key(start) or rhs[start] != g[start]):
+            old_key = queue.min_priority()
+            current, _ = queue.pop()
+            new_key = self._key(current)
+            if old_key < new_key:
+                queue.push(current, new_key)   # km grew since it was queued
+                continue
+            expanded += 1
+            if g[current] > rhs[current]:
+                g[current] = rhs[current]
+                for other in self._around(current):
+                    self._update_vertex(other)
+            else:
+                g[current] = INF
+                self._update_vertex(current)
+                for other in self._around(current):
+                    self._update_vertex(other)
+            if len(queue) > max_frontier:
+                max_frontier = len(queue)
+        self.expanded += expanded
+
+        if g[start] == INF:
+            return SearchResult(False, [], INF, expanded, max_frontier)
+        # walk down g: from every cell, the neighbor with the cheapest move plus g
+        path = [start]
+        current = start
+        while current != self.end and len(path) <= len(g):
+            best, best_cost = -1, INF
+            for nxt in self._around(current):
+                cost = self._move_cost(current, nxt) + g[nxt]
+                if cost < best_cost:
+                    best, best_cost = nxt, cost
+            if best < 0:
+                return SearchResult(False, [], INF, expanded, max_frontier)
+            current = best
+            path.append(current)
+        cost = g[start]
+        return SearchResult(True, [divmod(idx, self.cols) for idx in path], cost, expanded, max_frontier)
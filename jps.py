@@ -0,0 +1,215 @@
+from array import array
+
+# Jump Point Search for 4-connected grids where every move costs 1.
+#
+# A search that arrived at a cell moving horizontally only keeps going horizontally, or turns up/down.
+# A search that arrived moving vertically only keeps going vertically, or turns left/right.
+# Instead of adding every cell it passes to the open list, it "jumps" in a straight line
+# until it reaches a jump point:
+#   - moving horizontally: a cell with a "forced" neighbor above/below, i.e. the cell above (below) is
+#     free but the one above (below) the previous cell was a barrier;
+#   - moving vertically: a cell with a forced neighbor to the left/right, or a cell from which a
+#     horizontal jump would reach a jump point;
+#   - the goal, or (moving vertically) a cell in the goal row from which the goal can be reached horizontally.
+#
+# JumpTable precomputes, for every cell and direction, how far the next jump point is (JPS+),
+# so a jump is a table lookup instead of a scan. Only the goal checks are done per query.
+
+# directions, as indices into JumpTable.tables
+DOWN = 0
+UP = 1
+RIGHT = 2
+LEFT = 3
+
+
+class JumpTable:
+    def __init__(self, rows: int, cols: int, walls: bytes):
+        """
+        Precompute the jump distances of a map.
+        For a cell i and a direction d, tables[d][i] is:
+            > 0: the distance to the next jump point when jumping from i in direction d;
+            <= 0: minus the number of free cells in direction d before a barrier (or the border),
+                  when there is no jump point on the way.
+        Args:
+            rows (int): Number of rows of the map.
+            cols (int): Number of columns of the map.
+            walls (bytes): The barrier mask (1 = barrier), indexed by row*cols+col.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.walls: bytes = bytes(walls)  # kept to tell whether the table still matches a map
+        n = rows * cols
+        self.tables: list[array] = [array("i", [0]) * n for _ in range(4)]
+        self._build_horizontal()
+        self._build_vertical()
+
+    def matches(self, rows: int, cols: int, walls: bytes) -> bool:
+        """
+        Check whether the table was built for this exact map (same size and barriers).
+        """
+        return self.rows == rows and self.cols == cols and self.walls == walls
+
+    def _forced_horizontal(self, x: int, dc: int) -> bool:
+        """
+        Does the free cell x, entered horizontally from x-dc, have a forced neighbor above or below?
+        """
+        walls, cols = self.walls, self.cols
+        row = x // cols
+        if row > 0 and not walls[x - cols] and walls[x - dc - cols]:
+            return True
+        if row < self.rows - 1 and not walls[x + cols] and walls[x - dc + cols]:
+            return True
+        return False
+
+    def _forced_vertical(self, x: int, dr: int) -> bool:
+        """
+        Does the free cell x, entered vertically (dr = +-cols), have a forced neighbor left or right,
+        or a jump point reachable horizontally? The horizontal tables must be built already.
+        """
+        walls, cols = self.walls, self.cols
+        col = x % cols
+        if col > 0 and not walls[x - 1] and walls[x - 1 - dr]:
+            return True
+        if col < cols - 1 and not walls[x + 1] and walls[x + 1 - dr]:
+            return True
+        return self.tables[RIGHT][x] > 0 or self.tables[LEFT][x] > 0
+
+    def _build_horizontal(self) -> None:
+        walls, rows, cols = self.walls, self.rows, self.cols
+        right, left = self.tables[RIGHT], self.tables[LEFT]
+        for row in range(rows):
+            first = row * cols
+            last = first + cols - 1
+            # RIGHT: scan from the right border
+            for i in range(last - 1, first - 1, -1):
+                nxt = i + 1
+                if walls[nxt]:
+                    right[i] = 0
+                elif self._forced_horizontal(nxt, 1):
+                    right[i] = 1
+                else:
+                    d = right[nxt]
+                    right[i] = d + 1 if d > 0 else d - 1
+            # LEFT: scan from the left border
+            for i in range(first + 1, last + 1):
+                nxt = i - 1
+                if walls[nxt]:
+                    left[i] = 0
+                elif self._forced_horizontal(nxt, -1):
+                    left[i] = 1
+                else:
+                    d = left[nxt]
+                    left[i] = d + 1 if d > 0 else d - 1
+
+    def _build_vertical(self) -> None:
+        walls, rows, cols = self.walls, self.rows, self.cols
+        down, up = self.tables[DOWN], self.tables[UP]
+        for col in range(cols):
+            # DOWN: scan from the bottom border
+            for row in range(rows - 2, -1, -1):
+                i = row * cols + col
+                nxt = i + cols
+                if walls[nxt]:
+                    down[i] = 0
+                elif self._forced_vertical(nxt, cols):
+                    down[i] = 1
+                else:
+                    d = down[nxt]
+                    down[i] = d + 1 if d > 0 else d - 1
+            # UP: scan from the top border
+            for row in range(1, rows):
+                i = row * cols + col
+                nxt = i - cols
+                if walls[nxt]:
+                    up[i] = 0
+                elif self._forced_vertical(nxt, -cols):
+                    up[i] = 1
+                else:
+                    d = up[nxt]
+                    up[i] = d + 1 if d > 0 else d - 1
+
+    def jump(self, node: int, direction: int, goal: int) -> tuple[int, int]:
+        """
+        Jump from node in the given direction.
+        Args:
+            node (int): The flat index of the cell to jump from.
+            direction (int): DOWN, UP, RIGHT or LEFT.
+            goal (int): The flat index of the goal.
+        Returns:
+            tuple[int, int]: The jump point reached and its distance from node, or (-1, 0) if there is none.
+        """
+        cols = self.cols
+        d = self.tables[direction][node]
+        reach = d if d > 0 else -d
+        row, col = divmod(node, cols)
+        goal_row, goal_col = divmod(goal, cols)
+
+        if direction == RIGHT or direction == LEFT:
+            step = 1 if direction == RIGHT else -1
+            if goal_row == row:
+                k = (goal_col - col) * step
+                if 0 < k <= reach:
+                    return goal, k
+            if d > 0:
+                return node + d * step, d
+            return -1, 0
+
+        step = cols if direction == DOWN else -cols
+        k = (goal_row - row) * (1 if direction == DOWN else -1)
+        if 0 < k <= reach:
+            if goal_col == col:
+                return goal, k
+            if k < reach or d <= 0:
+                # the cell in the goal row is not a jump point by itself, so its horizontal
+                # tables hold the free distances to the barriers: is the goal within them?
+                crossing = node + k * step
+                dg = goal_col - col
+                if (dg > 0 and dg <= -self.tables[RIGHT][crossing]) or (dg < 0 and -dg <= -self.tables[LEFT][crossing]):
+                    return crossing, k
+        if d > 0:
+            return node + d * step, d
+        return -1, 0
+
+
+def directions(node: int, parent: int, cols: int) -> tuple[int, ...]:
+    """
+    The directions to jump in from node, given the jump point it was reached from (-1 for the start).
+    """
+    if parent < 0:
+        return DOWN, UP, RIGHT, LEFT
+    if node // cols == parent // cols:
+        # arrived horizontally: keep going, or turn up/down
+        return DOWN, UP, RIGHT if node > parent else LEFT
+    # arrived vertically: keep going, or turn left/right
+    return RIGHT, LEFT, DOWN if node > parent else UP
+
+
+def jump_table(grid, rows: int, cols: int, walls: bytes) -> JumpTable:
+    """
+    Get the jump table of a grid, building it if the grid has none or if its barriers changed since.
+    The table is cached on the grid (grid.jump_table), and Grid drops it as soon as a barrier changes.
+    """
+    table = getattr(grid, "jump_table", None)
+    if table is None or not table.matches(rows, cols, walls):
+        table = JumpTable(rows, cols, walls)
+        grid.jump_table = table
+    return table
+
+
+def expand_path(jump_points: list[int], cols: int) -> list[int]:
+    """
+    Fill in the straight segments between consecutive jump points.
+    Args:
+        jump_points (list[int]): The jump points from start to end.
+        cols (int): Number of columns of the map.
+    Returns:
+        list[int]: Every cell of the path, from start to end.
+    """
+    path = jump_points[:1]
+    for a, b in zip(jump_points, jump_points[1:]):
+        if a // cols == b // cols:
+            step = 1 if b > a else -1
+        else:
+            step = cols if b > a else -cols
+        path.extend(range(a + step, b + step, step))
+    return path
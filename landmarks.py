@@ -0,0 +1,106 @@
+import random
+from array import array
+import numpy as np
+from field_cache import UNREACHED, reverse_field
+from headless import _require_dense
+
+# Landmark heuristics (ALT: A*, landmarks, triangle inequality).
+#
+# A few landmark cells are picked once, and the distance from every cell to each of them is stored.
+# For any cells a and b and a landmark L, the triangle inequality gives
+#     d(a, L) <= d(a, b) + d(b, L)   so   d(a, b) >= d(a, L) - d(b, L)
+# which is a lower bound on the true distance that follows the walls of the map, unlike the Manhattan
+# distance. Without a cost layer the distances are symmetric and the bound is |d(a, L) - d(b, L)|.
+# The heuristic is the largest of those bounds and the Manhattan distance; it is admissible and
+# consistent, so A* keeps returning the cheapest path, only with far fewer expansions on maps
+# with many barriers.
+#
+# The distances are only valid for the map they were computed on (see valid_for).
+
+DEFAULT_LANDMARKS = 8
+
+
+class Landmarks:
+    def __init__(self, grid, count: int = DEFAULT_LANDMARKS, seed: int = 0):
+        """
+        Pick landmarks by farthest-point selection and compute their distance fields.
+        The first landmark is the cell farthest from a random free cell; every next one is the cell
+        farthest from all the landmarks picked so far, so they end up spread over the edges of the map.
+        Args:
+            grid (Grid | CompactGrid): The map. Its barriers and costs are read, the grid is not changed.
+            count (int): How many landmarks to pick (fewer if the map runs out of far away cells).
+            seed (int): Seed of the random starting cell.
+        """
+        _require_dense(grid, "Landmarks")
+        self.rows: int = grid.rows
+        self.cols: int = grid.cols
+        self.version: int = grid.version
+        self.symmetric: bool = grid.costs is None   # unit costs: d(a, b) == d(b, a)
+        walls = grid.barrier_mask()
+        costs = grid.costs
+
+        self.landmarks: list[int] = []
+        fields = []
+        free = np.flatnonzero(np.frombuffer(walls, dtype=np.uint8) == 0)
+        if len(free) and count > 0:
+            origin = int(free[random.Random(seed).randrange(len(free))])
+            nearest = np.asarray(reverse_field(self.rows, self.cols, walls, costs, origin))
+            while len(self.landmarks) < count:
+                landmark = int(nearest.argmax())
+                if nearest[landmark] <= 0 and self.landmarks:
+                    break   # every reachable cell is a landmark already
+                field = reverse_field(self.rows, self.cols, walls, costs, landmark)
+                self.landmarks.append(landmark)
+                fields.append(field)
+                distances = np.asarray(field)
+                nearest = distances if len(fields) == 1 else np.minimum(nearest, distances)
+
+        # store the fields as compactly as their largest distance allows: 2 bytes per cell per landmark
+        # on most maps, with the largest value of the type standing for UNREACHED
+        largest = max((int(np.asarray(field).max()) for field in fields), default=0)
+        typecode = "H" if largest < 0xFFFF else "I" if largest < 0xFFFFFFFF else "q"
+        self.unreached: int = UNREACHED if typecode == "q" else (1 << (8 * array(typecode).itemsize)) - 1
+        self.fields: list[array] = []
+        for field in fields:
+            values = np.asarray(field)
+            compact = array(typecode)
+            compact.frombytes(np.where(values == UNREACHED, self.unreached, values).astype(compact.typecode).tobytes())
+            self.fields.append(compact)
+        self.nbytes: int = sum(len(field) * field.itemsize for field in self.fields)
+
+    def valid_for(self, grid) -> bool:
+        """
+        Check that the map of the grid has not changed since the landmarks were computed.
+        After a change the heuristic may overestimate; build new Landmarks.
+        """
+        return grid.version == self.version and (grid.rows, grid.cols) == (self.rows, self.cols)
+
+    def heuristic(self, p1: tuple[int, int], p2: tuple[int, int]) -> int:
+        """
+        A lower bound on the cost of the cheapest path from p1 to p2, with the same signature as the
+        heuristics of heuristics.py, so it can be passed as heuristic= to astar, greedy and ida
+        (headless.py and searching_algorithms.py).
+        Args:
+            p1 (tuple[int, int]): The (row, col) position to start from.
+            p2 (tuple[int, int]): The (row, col) position to reach.
+        Returns:
+            int: The bound.
+        """
+        row1, col1 = p1
+        row2, col2 = p2
+        best = abs(row1 - row2) + abs(col1 - col2)
+        a = row1 * self.cols + col1
+        b = row2 * self.cols + col2
+        unreached = self.unreached
+        symmetric = self.symmetric
+        for field in self.fields:
+            da = field[a]
+            db = field[b]
+            if da == unreached or db == unreached:
+                continue
+            bound = da - db
+            if symmetric and bound < 0:
+                bound = -bound
+            if bound > best:
+                best = bound
+        return best
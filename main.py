@@ -1,6 +1,11 @@
 import pygame
+import time
 from utils import *
 from grid import Grid
+from renderer import Renderer
+from mapfile import MapFile, save_map
+from incremental import DStarLite
+from stats import StatsHook, counted
 from searching_algorithms import *
 
 
@@ -11,6 +16,9 @@ BUTTON_HEIGHT=40
 BUTTON_MARGIN=10
 GRID_ROWS=30
 GRID_COLS= 30
+FPS=60
+SPEEDS=[1, 4, 16, 64, 256]  # search steps per frame
+MAP_FILE='map.grid'  # written by w, read back by l
 
 
 COLORS = {
@@ -53,74 +61,160 @@ def main():
     grid=Grid(WIN, GRID_ROWS, GRID_COLS, GRID_WIDTH, GRID_HEIGHT)
     start=None
     end=None
-    started=False
+    search=None      # the running search (a generator from searching_algorithms), None when idle
+    paused=False
+    speed=SPEEDS[0]  # search steps per frame
+    stats=None       # StatsHook of the running (or last) search
+    planner=None     # D* Lite planner kept between replans (d); it follows the barrier edits as a grid hook
+
+    def watchers():
+        return [planner] if planner is not None else []
+
+    def launch(steps, heuristic=None):
+        nonlocal search, paused, stats
+        if start and end and search is None:
+            renderer.hide_overlay()
+            stats=StatsHook()
+            grid.hooks=[stats]+watchers()
+            if heuristic is None:
+                search=steps(grid, start, end)
+            else:
+                search=steps(grid, start, end, heuristic=counted(heuristic, grid.hooks))
+            paused=False
+            stats.on_start()
+
+    def advance(n):
+        # run n steps of the current search, or less if it finishes before
+        nonlocal search
+        for _ in range(n):
+            try:
+                spot=next(search)
+            except StopIteration as stop:
+                search=None
+                grid.hooks=watchers()
+                stats.on_finish(stop.value)
+                show_stats()
+                break
+            stats.on_step(spot)
+
+    def cancel():
+        nonlocal search
+        if search is not None:
+            search.close()
+            search=None
+            grid.hooks=watchers()
+            grid.clear_search()
+
+    def show_stats():
+        lines=stats.stats.lines()
+        texts=[FONT.render(line, True, (0, 0, 0)) for line in lines]
+        width=max(text.get_width() for text in texts)+2*BUTTON_MARGIN
+        height=sum(text.get_height() for text in texts)+2*BUTTON_MARGIN
+        panel=pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((255, 255, 255, 220))
+        y=BUTTON_MARGIN
+        for text in texts:
+            panel.blit(text, (BUTTON_MARGIN, y))
+            y+=text.get_height()
+        renderer.show_overlay(panel, (BUTTON_MARGIN, BUTTON_MARGIN))
 
     def run_bfs():
-        nonlocal started
-        if start and end:
-            started=True
-            bfs(lambda: draw_all(), grid, start, end)
-            started=False
+        launch(bfs_steps)
 
     def run_dfs():
-        nonlocal started
-        if start and end:
-            started=True
-            dfs(lambda: draw_all(), grid, start, end)
-            started=False
+        launch(dfs_steps)
 
     def run_astar():
-        nonlocal started
-        if start and end:
-            started = True
-            astar(lambda: draw_all(), grid, start, end)
-            started = False
+        launch(astar_steps, h_manhattan_distance)
+
+    def run_jps():
+        launch(jps_steps, h_manhattan_distance)
+
+    def run_bidirectional_bfs():
+        launch(bidirectional_bfs_steps)
+
+    def run_bidirectional_astar():
+        launch(bidirectional_astar_steps, h_manhattan_distance)
 
     def run_dls():
-        nonlocal started
-        if start and end:
-            started=True
-            dls(lambda: draw_all(), grid, start, end)
-            started=False
+        launch(dls_steps)
 
     def run_ucs():
-        nonlocal started
-        if start and end:
-            started=True
-            ucs(lambda: draw_all(), grid, start, end)
-            started=False
+        launch(ucs_steps)
 
     def run_greedy():
-        nonlocal started
-        if start and end:
-            started=True
-            greedy(lambda: draw_all(), grid, start, end)
-            started=False
+        launch(greedy_steps, h_euclidian_distance)
 
     def run_iddfs():
-        nonlocal started
-        if start and end:
-            started=True
-            iddfs(lambda: draw_all(), grid, start, end)
-            started=False
+        launch(iddfs_steps)
 
     def run_ida():
-        nonlocal started
-        if start and end:
-            started=True
-            ida(lambda: draw_all(), grid, start, end)
-            started=False
+        launch(ida_steps, h_manhattan_distance)
+
+    def replan():
+        # the first press plans from scratch, the next ones only repair what the edits since then changed
+        nonlocal planner, stats
+        if not start or not end or search is not None:
+            return
+        renderer.hide_overlay()
+        if planner is None or planner.end!=grid.index(end.row, end.col):
+            planner=DStarLite(grid, start, end)
+            grid.hooks=watchers()
+        elif planner.start!=grid.index(start.row, start.col):
+            planner.move_start(start)
+        grid.clear_search()
+        began=time.perf_counter()
+        result=planner.plan()
+        stats=StatsHook()
+        stats.stats.expanded=result.expanded
+        stats.stats.max_frontier=result.max_frontier
+        stats.stats.found=result.found
+        stats.stats.total_seconds=time.perf_counter()-began
+        for row, col in result.path[1:-1]:
+            grid.grid[row][col].make_path()
+        show_stats()
+
+    def cycle_speed():
+        nonlocal speed
+        speed=SPEEDS[(SPEEDS.index(speed)+1)%len(SPEEDS)]
+        speed_button.text=f"Speed: {speed}x"
+        renderer.invalidate()
 
     def clear_grid():
-        nonlocal start, end
+        nonlocal start, end, planner
+        cancel()
+        renderer.hide_overlay()
+        planner=None
+        grid.hooks=[]
         start=None
         end=None
         grid.reset()
 
+    def save_grid():
+        if search is None:
+            try:
+                save_map(grid, MAP_FILE)
+            except (OSError, ImportError) as e:   # saving packs the bits with NumPy
+                print(f"could not save {MAP_FILE}: {e}")
+
+    def load_grid():
+        nonlocal start, end, planner
+        cancel()
+        renderer.hide_overlay()
+        planner=None
+        grid.hooks=[]
+        try:
+            with MapFile(MAP_FILE) as f:
+                start, end=f.apply_to(grid)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"could not load {MAP_FILE}: {e}")
+
     button_colors=[(200, 200, 0), (200, 100, 0), (0, 200, 200), (200, 0, 200),
-                     (0, 150, 150), (150, 0, 150), (150, 150, 0), (100, 100, 200)]
-    button_texts=["BFS", "DFS", "A*", "DLS", "UCS", "Greedy", "IDDFS", "IDA"]
-    button_callbacks=[run_bfs, run_dfs, run_astar, run_dls, run_ucs, run_greedy, run_iddfs, run_ida]
+                     (0, 150, 150), (150, 0, 150), (150, 150, 0), (100, 100, 200), (100, 200, 100),
+                     (200, 150, 100), (100, 150, 200)]
+    button_texts=["BFS", "DFS", "A*", "DLS", "UCS", "Greedy", "IDDFS", "IDA", "JPS", "Bi-BFS", "Bi-A*"]
+    button_callbacks=[run_bfs, run_dfs, run_astar, run_dls, run_ucs, run_greedy, run_iddfs, run_ida, run_jps,
+                      run_bidirectional_bfs, run_bidirectional_astar]
 
     buttons=[]
     for i in range(len(button_texts)):
@@ -128,34 +222,68 @@ def main():
         y=BUTTON_MARGIN+i*(BUTTON_HEIGHT+BUTTON_MARGIN)
         buttons.append(Button(x, y, BUTTON_WIDTH, BUTTON_HEIGHT, button_colors[i%len(button_colors)],
                               button_texts[i], button_callbacks[i]))
+    y=BUTTON_MARGIN+len(buttons)*(BUTTON_HEIGHT+BUTTON_MARGIN)
+    speed_button=Button(GRID_WIDTH+2*BUTTON_MARGIN, y, BUTTON_WIDTH, BUTTON_HEIGHT, (180, 180, 180),
+                        f"Speed: {SPEEDS[0]}x", cycle_speed)
+    buttons.append(speed_button)
 
-    def draw_all():
-        WIN.fill((220, 220, 220))
-
-        for row in grid.grid:
-            for spot in row:
-                spot.draw(WIN)
-        grid.draw_grid_lines()
-
+    def draw_buttons(surface):
         for button in buttons:
-            button.draw(WIN)
-
-        pygame.display.update()
+            button.draw(surface)
 
+    # the background and the buttons are drawn once, after that only the spots that changed
+    renderer=Renderer(WIN, grid, (220, 220, 220), draw_buttons)
+    grid.renderer=renderer
 
+    def draw_all():
+        began=time.perf_counter()
+        renderer.draw()
+        if search is not None:
+            stats.on_draw(time.perf_counter()-began)
+
+
+    # the search advances speed steps per frame, at most FPS frames per second, and the events are
+    # handled between frames, so the window stays responsive while it runs
+    # space: pause/resume, right arrow: one step while paused, escape: cancel, c: clear the grid,
+    # s: show/hide the stats of the last search, w: write the map to MAP_FILE, l: load it back,
+    # d: plan with D* Lite, which keeps its search between presses and only repairs it after edits
+    clock=pygame.time.Clock()
     run=True
     while run:
+        if search is not None and not paused:
+            advance(speed)
         draw_all()
+        clock.tick(FPS)
         for event in pygame.event.get():
             if event.type==pygame.QUIT:
                 run=False
 
-            if started:
-                continue
+            if event.type==pygame.KEYDOWN:
+                if event.key==pygame.K_c:
+                    clear_grid()
+                elif event.key==pygame.K_SPACE and search is not None:
+                    paused=not paused
+                elif event.key==pygame.K_RIGHT and search is not None and paused:
+                    advance(1)
+                elif event.key==pygame.K_ESCAPE:
+                    cancel()
+                elif event.key==pygame.K_s and search is None and stats is not None:
+                    if renderer.overlay is None:
+                        show_stats()
+                    else:
+                        renderer.hide_overlay()
+                elif event.key==pygame.K_w:
+                    save_grid()
+                elif event.key==pygame.K_l:
+                    load_grid()
+                elif event.key==pygame.K_d:
+                    replan()
 
             if pygame.mouse.get_pressed()[0]:
                 pos = pygame.mouse.get_pos()
                 if pos[0]<GRID_WIDTH and pos[1]<GRID_HEIGHT:
+                    if search is not None:
+                        continue
                     row, col=grid.get_clicked_pos(pos)
                     if row<GRID_ROWS and col<GRID_COLS:
                         spot=grid.grid[row][col]
@@ -167,26 +295,22 @@ def main():
                             end.make_end()
                         elif spot!=start and spot!=end:
                             spot.make_barrier()
-                else:
+                elif event.type==pygame.MOUSEBUTTONDOWN:
                     for button in buttons:
                         if button.rect.collidepoint(pos):
                             button.click()
 
             elif pygame.mouse.get_pressed()[2]:
                 pos=pygame.mouse.get_pos()
-                if pos[0]<GRID_WIDTH and pos[1]<GRID_HEIGHT:
+                if pos[0]<GRID_WIDTH and pos[1]<GRID_HEIGHT and search is None:
                     row, col = grid.get_clicked_pos(pos)
-                    spot=grid.grid[row][col]
-                    spot.reset()
-                    if spot==start:
-                        start=None
-                    elif spot==end:
-                        end=None
-
-            if event.type==pygame.KEYDOWN:
-                if (event.key==
-                        pygame.K_c):
-                    clear_grid()
+                    if row<GRID_ROWS and col<GRID_COLS:
+                        spot=grid.grid[row][col]
+                        spot.reset()
+                        if spot==start:
+                            start=None
+                        elif spot==end:
+                            end=None
 
     pygame.quit()
 
@@ -0,0 +1,232 @@
+import mmap
+import struct
+import sys
+from compact_grid import CompactGrid, START, END
+
+# Maps on disk.
+#
+# The binary format (all integers little-endian):
+#   header   MAGIC, rows (u32), cols (u32), flags (u32), start row, start col, end row, end col (i32, -1 if none)
+#   barriers one bit per cell (1 = barrier), row by row, the first cell in the highest bit of the first byte
+#   costs    one byte per cell, only if flags has HAS_COSTS (see terrain.py)
+#
+# MapFile opens such a file through mmap and only reads the header: a single cell can be tested
+# straight from the mapped bits, and the whole barrier mask is unpacked (by NumPy) only when asked for.
+# NumPy is imported by the functions that pack and unpack the bits, so importing this module (as main.py
+# does) does not need it; saving and loading a map do.
+#
+# MovingAI benchmark maps (.map, https://movingai.com/benchmarks/formats.html) can be imported too.
+
+MAGIC = b"GRIDMAP1"
+HAS_COSTS = 1
+_HEADER = struct.Struct("<8sIIIiiii")
+
+# MovingAI terrain: '.' and 'G' are ground, 'S' is swamp (passable from ground); everything else
+# ('@', 'O' out of bounds, 'T' trees, 'W' water) blocks a ground unit
+_MOVINGAI_PASSABLE = b".GS"
+_MOVINGAI_TABLE = bytes(0 if bytes([value]) in _MOVINGAI_PASSABLE else 1 for value in range(256))
+
+# translation tables that map a CompactGrid cell to 1 if it is the start (end), 0 otherwise
+_START_TABLE = bytes(1 if value & START else 0 for value in range(256))
+_END_TABLE = bytes(1 if value & END else 0 for value in range(256))
+
+
+def _flag_position(grid, flag: int) -> tuple[int, int]:
+    """
+    Find the cell of a Grid or CompactGrid that has the flag (START or END), (-1, -1) if there is none.
+    """
+    if isinstance(grid, CompactGrid):
+        idx = grid.cells.translate(_START_TABLE if flag == START else _END_TABLE).find(1)
+        return (-1, -1) if idx < 0 else divmod(idx, grid.cols)
+    for row in grid.grid:
+        for spot in row:
+            if spot.state & flag:
+                return spot.get_position()
+    return -1, -1
+
+
+def save_map(grid, path: str) -> None:
+    """
+    Write the map of a grid (size, barriers, cost layer, start and end) to a binary map file.
+    Args:
+        grid (Grid | CompactGrid): The grid to save. The search marks (open, closed, path) are not saved.
+        path (str): The file to write.
+    Returns:
+        None
+    """
+    import numpy as np   # NumPy is only needed to pack the barrier bits
+
+    rows, cols = grid.rows, grid.cols
+    walls = np.frombuffer(grid.barrier_mask(), dtype=np.uint8)
+    start = _flag_position(grid, START)
+    end = _flag_position(grid, END)
+    costs = grid.costs
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, rows, cols, HAS_COSTS if costs is not None else 0, *start, *end))
+        f.write(np.packbits(walls).tobytes())
+        if costs is not None:
+            f.write(costs)
+
+
+class MapFile:
+    def __init__(self, path: str):
+        """
+        Open a binary map file through mmap. Only the header is read here.
+        Args:
+            path (str): The file to open.
+        Raises:
+            ValueError: If the file is not a map file (or is truncated).
+        """
+        with open(path, "rb") as f:
+            self.data: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a map file")
+        magic, rows, cols, flags, start_row, start_col, end_row, end_col = _HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a map file")
+        self.rows: int = rows
+        self.cols: int = cols
+        self.has_costs: bool = bool(flags & HAS_COSTS)
+        self.start: tuple[int, int] | None = (start_row, start_col) if start_row >= 0 else None
+        self.end: tuple[int, int] | None = (end_row, end_col) if end_row >= 0 else None
+        self._bits: int = _HEADER.size                        # offset of the barrier bits
+        self._costs: int = self._bits + (rows * cols + 7) // 8   # offset of the cost layer
+        if len(self.data) < self._costs + (rows * cols if self.has_costs else 0):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __enter__(self) -> "MapFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+        """
+        self.data.close()
+
+    def is_barrier(self, row: int, col: int) -> bool:
+        """
+        Test one cell, straight from the mapped bits.
+        """
+        idx = row * self.cols + col
+        return (self.data[self._bits + (idx >> 3)] >> (7 - (idx & 7))) & 1 == 1
+
+    def barrier_mask(self) -> bytes:
+        """
+        Unpack the barrier bits into one byte per cell (1 = barrier), indexed by row*cols+col.
+        """
+        import numpy as np   # NumPy is only needed to unpack the barrier bits
+
+        n = self.rows * self.cols
+        bits = np.frombuffer(self.data, dtype=np.uint8, count=(n + 7) // 8, offset=self._bits)
+        return np.unpackbits(bits, count=n).tobytes()
+
+    def costs(self) -> bytearray | None:
+        """
+        Copy the cost layer out of the file, None if the map has none.
+        """
+        if not self.has_costs:
+            return None
+        return bytearray(self.data[self._costs:self._costs + self.rows * self.cols])
+
+    def to_compact_grid(self) -> CompactGrid:
+        """
+        Build a CompactGrid with the map of the file.
+        """
+        grid = CompactGrid(self.rows, self.cols)
+        grid.cells[:] = self.barrier_mask()   # BARRIER is 1, so the mask is the cell states
+        grid.costs = self.costs()
+        if self.start is not None:
+            grid.cells[grid.index(*self.start)] = START
+        if self.end is not None:
+            grid.cells[grid.index(*self.end)] = END
+        grid.version += 1
+        return grid
+
+    def apply_to(self, grid) -> tuple:
+        """
+        Replace the map of a Spot based Grid of the same size with the map of the file.
+        Args:
+            grid (Grid): The grid to change.
+        Returns:
+            tuple: The start and end spots (None where the file has none).
+        Raises:
+            ValueError: If the grid does not have the size of the map.
+        """
+        if (grid.rows, grid.cols) != (self.rows, self.cols):
+            raise ValueError(f"the map is {self.rows}x{self.cols}, the grid is {grid.rows}x{grid.cols}")
+        grid.reset()
+        walls = self.barrier_mask()
+        idx = walls.find(1)
+        while idx >= 0:
+            grid.spot_at(idx).make_barrier()
+            idx = walls.find(1, idx + 1)
+        costs = self.costs()
+        if costs is not None:
+            grid.costs = costs
+            grid.version += 1
+        start = end = None
+        if self.start is not None:
+            start = grid.grid[self.start[0]][self.start[1]]
+            start.make_start()
+        if self.end is not None:
+            end = grid.grid[self.end[0]][self.end[1]]
+            end.make_end()
+        return start, end
+
+
+def load_map(path: str) -> CompactGrid:
+    """
+    Read a binary map file into a CompactGrid.
+    """
+    with MapFile(path) as f:
+        return f.to_compact_grid()
+
+
+def import_movingai(path: str) -> CompactGrid:
+    """
+    Read a MovingAI .map file (a "type"/"height"/"width" header, a "map" line, then one line of
+    characters per row) into a CompactGrid. The cells are converted with one bytes.translate per row.
+    Args:
+        path (str): The .map file.
+    Returns:
+        CompactGrid: The map; ground and swamp are free, everything else is a barrier.
+    Raises:
+        ValueError: If the file does not look like a MovingAI map.
+    """
+    with open(path, "rb") as f:
+        header = {}
+        for line in f:
+            line = line.strip()
+            if line == b"map":
+                break
+            if line:
+                key, _, value = line.partition(b" ")
+                header[key.decode()] = value.strip().decode()
+        else:
+            raise ValueError(f"{path}: no 'map' line")
+        try:
+            rows, cols = int(header["height"]), int(header["width"])
+        except (KeyError, ValueError):
+            raise ValueError(f"{path}: missing or bad height/width") from None
+
+        grid = CompactGrid(rows, cols)
+        for row in range(rows):
+            line = f.readline().rstrip(b"\r\n")
+            if len(line) != cols:
+                raise ValueError(f"{path}: row {row} has {len(line)} cells, expected {cols}")
+            grid.cells[row * cols:(row + 1) * cols] = line.translate(_MOVINGAI_TABLE)
+    grid.version += 1
+    return grid
+
+
+if __name__ == "__main__":
+    # python mapfile.py some.map some.grid: convert a MovingAI map to the binary format
+    if len(sys.argv) != 3:
+        sys.exit("usage: python mapfile.py <input.map> <output file>")
+    save_map(import_movingai(sys.argv[1]), sys.argv[2])
@@ -0,0 +1,108 @@
+from utils import *
+
+# color used as "transparent" on the grid lines overlay (not used by any spot)
+_TRANSPARENT = (255, 0, 255)
+
+
+class Renderer:
+    def __init__(self, win: pygame.Surface, grid, fill: tuple = COLORS['WHITE'], draw_static=None):
+        """
+        Draws a grid with dirty rectangles: after the first frame, only the spots whose state changed
+        since the last frame are drawn again, and only their areas are sent to the display.
+        Everything that does not change (the background, the grid lines, a button panel) is drawn once
+        on cached surfaces.
+        Args:
+            win (pygame.Surface): The Pygame surface (window) to draw on.
+            grid (Grid): The grid to draw. Its spots add themselves to grid.dirty when their state changes.
+            fill (tuple): The background color of the window.
+            draw_static (callable, optional): Draws the static parts of the window (e.g. the buttons)
+                on the surface it is given.
+        """
+        self.win: pygame.Surface = win
+        self.grid = grid
+        self.fill: tuple = fill
+        self.draw_static = draw_static
+        self.background: pygame.Surface = None
+        self.lines: pygame.Surface = None
+        self.full: bool = True  # the next frame redraws the whole window
+        self.overlay: pygame.Surface = None     # drawn over the grid, see show_overlay
+        self.overlay_pos: tuple[int, int] = (0, 0)
+
+    def invalidate(self) -> None:
+        """
+        Rebuild the cached surfaces and redraw the whole window on the next frame
+        (e.g. when the button panel changed).
+        Returns:
+            None
+        """
+        self.background = None
+        self.full = True
+
+    def show_overlay(self, surface: pygame.Surface, pos: tuple[int, int]) -> None:
+        """
+        Draw a surface (e.g. a text panel) over the grid on every frame, until hide_overlay.
+        Args:
+            surface (pygame.Surface): What to draw.
+            pos (tuple[int, int]): The top-left corner where it is drawn.
+        Returns:
+            None
+        """
+        self.overlay = surface
+        self.overlay_pos = pos
+        self.full = True
+
+    def hide_overlay(self) -> None:
+        """
+        Stop drawing the overlay (the spots under it are drawn again on the next frame).
+        Returns:
+            None
+        """
+        if self.overlay is not None:
+            self.overlay = None
+            self.full = True
+
+    def _build_static(self) -> None:
+        size = self.win.get_size()
+        self.background = pygame.Surface(size)
+        self.background.fill(self.fill)
+        if self.draw_static is not None:
+            self.draw_static(self.background)
+
+        self.lines = pygame.Surface(size)
+        self.lines.fill(_TRANSPARENT)
+        self.lines.set_colorkey(_TRANSPARENT)
+        self.grid.draw_grid_lines(self.lines)
+
+    def draw(self) -> None:
+        """
+        Draw one frame: the whole window the first time (or after invalidate, or when most of the grid
+        changed), otherwise only the dirty spots.
+        Returns:
+            None
+        """
+        if self.background is None:
+            self._build_static()
+
+        dirty = self.grid.dirty
+        if self.full or len(dirty) * 4 > self.grid.rows * self.grid.cols:
+            self.win.blit(self.background, (0, 0))
+            for row in self.grid.grid:
+                for spot in row:
+                    spot.draw(self.win)
+            self.win.blit(self.lines, (0, 0))
+            if self.overlay is not None:
+                self.win.blit(self.overlay, self.overlay_pos)
+            pygame.display.update()
+            self.full = False
+        elif dirty:
+            rects = []
+            for spot in dirty:
+                rect = spot.draw(self.win)
+                self.win.blit(self.lines, rect, rect)   # the grid lines over that spot
+                rects.append(rect)
+            if self.overlay is not None:
+                # spots drawn under the overlay would cover it
+                rects.append(self.win.blit(self.overlay, self.overlay_pos))
+            pygame.display.update(rects)
+        dirty.clear()
+
@@ -1,37 +1,87 @@
-from itertools import count
 from utils import *
+import time
 from collections import deque
-from queue import PriorityQueue
+from frontier import BucketQueue, make_frontier
+from jps import jump_table, directions, expand_path
 from grid import Grid
 from spot import Spot
-import math
+from heuristics import h_manhattan_distance, h_euclidian_distance
+
+# Every search is a generator, <name>_steps(grid, start, end, ...), that yields after each step
+# (the spot it just expanded or changed) and returns True/False once it is done, so the caller decides
+# when to draw and can pause, step or drop the search at any time (see main.py).
+# <name>(draw, grid, start, end, ...) runs the whole search in one call, drawing after every step.
+
+
+def run(steps, draw: callable, hooks: list=()):
+    """
+    Run a search generator to the end, calling draw after every step, and return its result.
+    This is the blocking way to run a search; main.py drives the generators itself instead.
+    The hooks (see stats.py) are told about every step, the time spent drawing, and the result.
+    """
+    for hook in hooks:
+        hook.on_start()
+    while True:
+        try:
+            spot=next(steps)
+        except StopIteration as stop:
+            for hook in hooks:
+                hook.on_finish(stop.value)
+            return stop.value
+        for hook in hooks:
+            hook.on_step(spot)
+        if hooks:
+            began=time.perf_counter()
+            draw()
+            for hook in hooks:
+                hook.on_draw(time.perf_counter()-began)
+        else:
+            draw()
 
 
-def reconstruct_path(came_from: dict, current: Spot, draw: callable):
+def _expanded(grid: Grid, spot: Spot) -> None:
+    """
+    Tell the hooks of the grid (see stats.py) that the search expands spot. The generators yield on other
+    steps too (backtracking, cutoffs, drawing the path), so the steps alone do not count the expansions.
+    """
+    for hook in grid.hooks:
+        hook.on_expand(spot)
+
+
+def _new_pass(grid: Grid) -> None:
+    """
+    Tell the hooks of the grid that an iterative deepening search starts a new pass.
+    """
+    for hook in grid.hooks:
+        hook.on_pass()
+
+
+def trace_path(came_from: dict, current: Spot):
     while current in came_from:
         current=came_from[current]
         current.make_path()
-        draw()
+        yield current
 
 
-def bfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+def reconstruct_path(came_from: dict, current: Spot, draw: callable):
+    run(trace_path(came_from, current), draw)
+
+
+def bfs_steps(grid: Grid, start: Spot, end: Spot):
     if start==end:
         return True
 
-    for row in grid.grid:
-        for spot in row:
-            spot.update_neighbors(grid.grid)
-
     queue=deque([start])
     came_from ={}
     visited={start}
 
     while queue:
-        draw()
         current=queue.popleft()
+        _expanded(grid, current)
+        yield current
 
         if current==end:
-            reconstruct_path(came_from, end, draw)
+            yield from trace_path(came_from, end)
             end.make_end()
             start.make_start()
             return True
@@ -49,24 +99,21 @@ def bfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     return False
 
 
-def dfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+def dfs_steps(grid: Grid, start: Spot, end: Spot):
     if start==end:
         return True
 
-    for row in grid.grid:
-        for spot in row:
-            spot.update_neighbors(grid.grid)
-
     stack=[start]
     came_from={}
     visited={start}
 
     while stack:
-        draw()
         current=stack.pop()
+        _expanded(grid, current)
+        yield current
 
         if current==end:
-            reconstruct_path(came_from, end, draw)
+            yield from trace_path(came_from, end)
             end.make_end()
             start.make_start()
             return True
@@ -84,62 +131,40 @@ def dfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     return False
 
 
-def h_manhattan_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
-    x1, y1=p1
-    x2, y2=p2
-    return abs(x1-x2)+abs(y1-y2)
-
-
-def h_euclidian_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
-    x1, y1=p1
-    x2, y2=p2
-    return math.sqrt((x1-x2)**2+(y1-y2)**2)
-
-
-def astar(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+def astar_steps(grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance):
     if start==end:
         return True
 
-    for row in grid.grid:
-        for spot in row:
-            spot.update_neighbors(grid.grid)
-
-    counter=count()
-    open_set=PriorityQueue()
-    open_set.put((0, next(counter), start))
+    # one entry per cell, keyed by the cell index; ties on f go to the smaller h (the deeper node)
+    h=heuristic(start.get_position(), end.get_position())
+    open_set=make_frontier(grid.rows*grid.cols, h)
+    bucketed=isinstance(open_set, BucketQueue)
+    open_set.push(grid.index(start.row, start.col), h if bucketed else (h, h))
     came_from={}
 
     g_score={spot: float("inf") for row in grid.grid for spot in row}
     g_score[start]=0
 
-    f_score={spot: float("inf") for row in grid.grid for spot in row}
-    f_score[start]=h_manhattan_distance(start.get_position(), end.get_position())
-
-    open_set_hash={start}
-
-    while not open_set.empty():
-        draw()
-        current=open_set.get()[2]
-        open_set_hash.discard(current)
+    while open_set:
+        current=grid.spot_at(open_set.pop()[0])
+        _expanded(grid, current)
+        yield current
 
         if current==end:
-            reconstruct_path(came_from, end, draw)
+            yield from trace_path(came_from, end)
             end.make_end()
             start.make_start()
             return True
 
         for neighbor in current.neighbors:
-            temp_g_score=g_score[current]+1
+            temp_g_score=g_score[current]+grid.get_cost(neighbor.row, neighbor.col)
 
             if temp_g_score<g_score[neighbor]:
                 came_from[neighbor]=current
                 g_score[neighbor]=temp_g_score
-                f_score[neighbor]=temp_g_score+h_manhattan_distance(neighbor.get_position(), end.get_position())
-
-                if neighbor not in open_set_hash:
-                    open_set.put((f_score[neighbor], next(counter), neighbor))
-                    open_set_hash.add(neighbor)
-                    neighbor.make_open()
+                h=heuristic(neighbor.get_position(), end.get_position())
+                open_set.push(grid.index(neighbor.row, neighbor.col), temp_g_score+h if bucketed else (temp_g_score+h, h))
+                neighbor.make_open()
 
         if current!=start:
             current.make_closed()
@@ -147,11 +172,167 @@ def astar(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     return False
 
 
-def depth_limited_search(draw, grid: Grid, current: Spot, end: Spot, came_from: dict, visited:set, limit: int, depth: int = 0) -> bool:
-    draw()
+def jps_steps(grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance):
+    if start==end:
+        return True
+
+    # Jump Point Search assumes every move costs the same
+    if grid.costs is not None:
+        return (yield from astar_steps(grid, start, end, heuristic))
+
+    cols=grid.cols
+    table=jump_table(grid, grid.rows, cols, grid.barrier_mask())
+    start_idx=grid.index(start.row, start.col)
+    end_idx=grid.index(end.row, end.col)
+
+    # the open list is a bucket queue only if the heuristic gives integers, as in astar_steps
+    h=heuristic(start.get_position(), end.get_position())
+    open_set=make_frontier(grid.rows*cols, h)
+    open_set.push(start_idx, h)
+    came_from={}
+    g_score={start_idx: 0}
+    closed=set()
+
+    while open_set:
+        current, _=open_set.pop()
+        _expanded(grid, grid.spot_at(current))
+        yield grid.spot_at(current)
+        closed.add(current)
+
+        if current==end_idx:
+            jump_points=[end_idx]
+            while jump_points[-1] in came_from:
+                jump_points.append(came_from[jump_points[-1]])
+            jump_points.reverse()
+            for idx in expand_path(jump_points, cols)[1:-1]:
+                spot=grid.spot_at(idx)
+                spot.make_path()
+                yield spot
+            end.make_end()
+            start.make_start()
+            return True
+
+        for direction in directions(current, came_from.get(current, -1), cols):
+            neighbor, distance=table.jump(current, direction, end_idx)
+            if neighbor<0 or neighbor in closed:
+                continue
+            temp_g_score=g_score[current]+distance
+            if temp_g_score<g_score.get(neighbor, float("inf")):
+                came_from[neighbor]=current
+                g_score[neighbor]=temp_g_score
+                open_set.push(neighbor, temp_g_score+heuristic(divmod(neighbor, cols), end.get_position()))
+                grid.spot_at(neighbor).make_open()
+
+        if current!=start_idx:
+            grid.spot_at(current).make_closed()
+
+    return False
+
+
+def bidirectional_bfs_steps(grid: Grid, start: Spot, end: Spot):
+    if start==end:
+        return True
+
+    # index 0 is the search from start, index 1 the search from end
+    came_from=({}, {})
+    visited=({start}, {end})
+    frontiers=[[start], [end]]
+
+    while frontiers[0] and frontiers[1]:
+        # grow the smaller frontier by one whole layer
+        side=0 if len(frontiers[0])<=len(frontiers[1]) else 1
+        mine, other, parents=visited[side], visited[1-side], came_from[side]
+        next_layer=[]
+        for current in frontiers[side]:
+            _expanded(grid, current)
+            yield current
+            for neighbor in current.neighbors:
+                if neighbor in mine or neighbor.is_barrier():
+                    continue
+                mine.add(neighbor)
+                parents[neighbor]=current
+                if neighbor in other:
+                    # the two trees meet here: walk each of them back to its root
+                    neighbor.make_path()
+                    yield from trace_path(came_from[0], neighbor)
+                    yield from trace_path(came_from[1], neighbor)
+                    end.make_end()
+                    start.make_start()
+                    return True
+                next_layer.append(neighbor)
+                neighbor.make_open()
+            if current!=start and current!=end:
+                current.make_closed()
+        frontiers[side]=next_layer
+
+    return False
+
+
+def bidirectional_astar_steps(grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance):
+    if start==end:
+        return True
+
+    # index 0 is the search from start (towards end), index 1 the search from end (towards start)
+    targets=(end, start)
+    came_from=({}, {})
+    g_score=({start: 0}, {end: 0})
+    closed=(set(), set())
+    h=heuristic(start.get_position(), end.get_position())
+    open_sets=(make_frontier(grid.rows*grid.cols, h), make_frontier(grid.rows*grid.cols, h))
+    open_sets[0].push(grid.index(start.row, start.col), h)
+    open_sets[1].push(grid.index(end.row, end.col), h)
+    best=float("inf")   # cost of the best path found where the two searches meet
+    meeting=None
+
+    while open_sets[0] and open_sets[1]:
+        # no open node on either side can lead to a path cheaper than best anymore
+        if best<=max(open_sets[0].min_priority(), open_sets[1].min_priority()):
+            break
+        side=0 if len(open_sets[0])<=len(open_sets[1]) else 1
+        mine, other=g_score[side], g_score[1-side]
+        current=grid.spot_at(open_sets[side].pop()[0])
+        _expanded(grid, current)
+        yield current
+        closed[side].add(current)
+
+        for neighbor in current.neighbors:
+            # the forward search pays for entering neighbor, the backward one for entering current
+            step_to=neighbor if side==0 else current
+            temp_g_score=mine[current]+grid.get_cost(step_to.row, step_to.col)
+            if temp_g_score<mine.get(neighbor, float("inf")):
+                mine[neighbor]=temp_g_score
+                came_from[side][neighbor]=current
+                if neighbor not in closed[side]:
+                    f_score=temp_g_score+heuristic(neighbor.get_position(), targets[side].get_position())
+                    open_sets[side].push(grid.index(neighbor.row, neighbor.col), f_score)
+                    neighbor.make_open()
+            if neighbor in other and temp_g_score+other[neighbor]<best:
+                best=temp_g_score+other[neighbor]
+                meeting=(current, neighbor) if side==0 else (neighbor, current)
+
+        if current!=start and current!=end:
+            current.make_closed()
+
+    if meeting is None:
+        return False
+
+    # meeting is an edge u->v: start..u comes from the forward tree, v..end from the backward tree
+    u, v=meeting
+    u.make_path()
+    v.make_path()
+    yield from trace_path(came_from[0], u)
+    yield from trace_path(came_from[1], v)
+    end.make_end()
+    start.make_start()
+    return True
+
+
+def depth_limited_steps(grid: Grid, current: Spot, end: Spot, came_from: dict, visited:set, limit: int, depth: int = 0):
+    _expanded(grid, current)
+    yield current
 
     if current==end:
-        reconstruct_path(came_from, end, draw)
+        yield from trace_path(came_from, end)
         end.make_end()
         return True
 
@@ -160,67 +341,83 @@ def depth_limited_search(draw, grid: Grid, current: Spot, end: Spot, came_from:
 
     visited.add(current)
 
-    for neighbor in current.neighbors:
-        if neighbor not in came_from and not neighbor.is_barrier():
-            came_from[neighbor]=current
-            neighbor.make_open()
-            if depth_limited_search(draw, grid, neighbor, end, came_from, visited, limit, depth+1):
-                return True
+    # explicit stack of (spot, neighbors left to try, depth) instead of recursion, so long paths don't hit
+    # the recursion limit; the neighbors are reversed so that pop() tries them in their usual order
+    stack=[(current, current.neighbors[::-1], depth)]
+
+    while stack:
+        spot, pending, spot_depth=stack[-1]
+        if not pending:
+            stack.pop()
+            if stack:
+                # a subtree that did not reach the end
+                spot.make_closed()
+                yield spot
+            continue
+
+        neighbor=pending.pop()
+        if neighbor in came_from or neighbor in visited or neighbor.is_barrier():
+            continue
+        came_from[neighbor]=spot
+        neighbor.make_open()
+        _expanded(grid, neighbor)
+        yield neighbor
+
+        if neighbor==end:
+            yield from trace_path(came_from, end)
+            end.make_end()
+            return True
+
+        if spot_depth+1>=limit:
             neighbor.make_closed()
-            draw()
+            yield neighbor
+            continue
 
-    return False
+        visited.add(neighbor)
+        stack.append((neighbor, neighbor.neighbors[::-1], spot_depth+1))
 
+    return False
 
-def dls(draw: callable, grid: Grid, start: Spot, end: Spot, limit: int=50) -> bool:
-    for row in grid.grid:
-        for spot in row:
-            spot.update_neighbors(grid.grid)
 
+def dls_steps(grid: Grid, start: Spot, end: Spot, limit: int=50):
     came_from={}
     visited=set()
-    success=depth_limited_search(draw, grid, start, end, came_from, visited, limit)
+    success=yield from depth_limited_steps(grid, start, end, came_from, visited, limit)
     start.make_start()
     end.make_end()
     return success
 
 
-def ucs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+def ucs_steps(grid: Grid, start: Spot, end: Spot):
     if start==end:
         return True
 
-    for row in grid.grid:
-        for spot in row:
-            spot.update_neighbors(grid.grid)
-
-    pq=PriorityQueue()
-    tie=count()
-    pq.put((0, next(tie), start))
+    pq=make_frontier(grid.rows*grid.cols, 0)
+    pq.push(grid.index(start.row, start.col), 0)
     came_from={}
     cost={spot: float("inf") for row in grid.grid for spot in row}
     cost[start]=0
     visited=set()
 
-    while not pq.empty():
-        draw()
-        current_cost, _, current=pq.get()
-        if current in visited:
-            continue
-
+    while pq:
+        idx, current_cost=pq.pop()
+        current=grid.spot_at(idx)
+        _expanded(grid, current)
+        yield current
         visited.add(current)
 
         if current==end:
-            reconstruct_path(came_from, end, draw)
+            yield from trace_path(came_from, end)
             end.make_end()
             start.make_start()
             return True
 
         for neighbor in current.neighbors:
-            new_cost=current_cost+1
-            if new_cost<cost[neighbor]:
+            new_cost=current_cost+grid.get_cost(neighbor.row, neighbor.col)
+            if new_cost<cost[neighbor] and neighbor not in visited:
                 cost[neighbor]=new_cost
                 came_from[neighbor]=current
-                pq.put((new_cost, next(tie), neighbor))
+                pq.push(grid.index(neighbor.row, neighbor.col), new_cost)
                 neighbor.make_open()
 
         if current!=start:
@@ -229,26 +426,23 @@ def ucs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
     return False
 
 
-def greedy(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_euclidian_distance) -> bool:
+def greedy_steps(grid: Grid, start: Spot, end: Spot, heuristic=h_euclidian_distance):
     if start==end:
         return True
 
-    for row in grid.grid:
-        for spot in row:
-            spot.update_neighbors(grid.grid)
-
-    pq=PriorityQueue()
-    tie=count()
-    pq.put((heuristic(start.get_position(), end.get_position()), next(tie), start))
+    priority=heuristic(start.get_position(), end.get_position())
+    pq=make_frontier(grid.rows*grid.cols, priority)
+    pq.push(grid.index(start.row, start.col), priority)
     came_from={}
     visited={start}
 
-    while not pq.empty():
-        draw()
-        _, _, current=pq.get()
+    while pq:
+        current=grid.spot_at(pq.pop()[0])
+        _expanded(grid, current)
+        yield current
 
         if current==end:
-            reconstruct_path(came_from, end, draw)
+            yield from trace_path(came_from, end)
             end.make_end()
             start.make_start()
             return True
@@ -258,7 +452,7 @@ def greedy(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_eucli
                 visited.add(neighbor)
                 came_from[neighbor]=current
                 priority=heuristic(neighbor.get_position(), end.get_position())
-                pq.put((priority, next(tie), neighbor))
+                pq.push(grid.index(neighbor.row, neighbor.col), priority)
                 neighbor.make_open()
 
         if current!=start:
@@ -267,86 +461,86 @@ def greedy(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_eucli
     return False
 
 
-def iddfs(draw: callable, grid: Grid, start: Spot, end: Spot, max_depth: int=100) -> bool:
+def iddfs_steps(grid: Grid, start: Spot, end: Spot, max_depth: int=100):
     for depth in range(max_depth+1):
-        for row in grid.grid:
-            for spot in row:
-                spot.update_neighbors(grid.grid)
+        _new_pass(grid)
         came_from={}
         visited=set()
-        if depth_limited_search(draw, grid, start, end, came_from, visited, depth):
+        if (yield from depth_limited_steps(grid, start, end, came_from, visited, depth)):
             start.make_start()
             end.make_end()
             return True
     return False
 
 
-def ida(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance)->bool:
+def ida_steps(grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance,
+        max_iterations: int=100, max_bound: float=1000):
     if start==end:
         return True
 
-    for row in grid.grid:
-        for spot in row:
-            spot.update_neighbors(grid.grid)
-
-    path_found = False
-    final_path = []
-
-    def search(current: Spot, g: float, bound: float, path: list)->float:
-        nonlocal path_found, final_path
-
-        for event in pygame.event.get():
-            if event.type==pygame.QUIT:
-                return float('inf')
-
-        f=g+heuristic(current.get_position(), end.get_position())
-
+    def search(bound: float):
+        """
+        One depth-first pass with the given bound, with an explicit stack instead of recursion.
+        path grows and shrinks in place and on_path mirrors it, so the "already on the path?"
+        check is O(1) and no path is copied per step.
+        """
+        f=heuristic(start.get_position(), end.get_position())
         if f>bound:
-            return f
-
-        if current==end:
-            path_found=True
-            final_path=path.copy()
-            return f
-
-        min_bound = float('inf')
-
-        for neighbor in current.neighbors:
-            if neighbor.is_barrier() or neighbor in path:
+            return f, None
+
+        min_bound=float('inf')
+        path=[start]
+        on_path={start}
+        g_stack=[0]
+        pending=[start.neighbors[::-1]]
+
+        while pending:
+            neighbors=pending[-1]
+            if not neighbors:
+                # backtrack
+                pending.pop()
+                g_stack.pop()
+                spot=path.pop()
+                on_path.discard(spot)
+                if path and spot!=end:
+                    spot.reset()
+                    yield spot
                 continue
 
-            new_path=path+[neighbor]
+            neighbor=neighbors.pop()
+            if neighbor.is_barrier() or neighbor in on_path:
+                continue
 
             if neighbor!=end:
                 neighbor.make_open()
-            draw()
-            pygame.time.delay(10)
+            _expanded(grid, neighbor)
+            yield neighbor
 
-            result=search(neighbor, g + 1, bound, new_path)
+            g=g_stack[-1]+grid.get_cost(neighbor.row, neighbor.col)
+            f=g+heuristic(neighbor.get_position(), end.get_position())
 
-            if path_found:
-                return result
+            if f>bound:
+                min_bound=min(min_bound, f)
+                if neighbor!=end:
+                    neighbor.reset()
+                yield neighbor
+                continue
 
-            if result<min_bound:
-                min_bound=result
+            path.append(neighbor)
+            if neighbor==end:
+                return f, path
 
-            if neighbor!=start and neighbor!=end:
-                neighbor.reset()
-            draw()
-            pygame.time.delay(5)
+            on_path.add(neighbor)
+            g_stack.append(g)
+            pending.append(neighbor.neighbors[::-1])
 
-        return min_bound
+        return min_bound, None
 
     bound=heuristic(start.get_position(), end.get_position())
     start.make_start()
     end.make_end()
 
-    max_iterations=100
-
     for iteration in range(max_iterations):
-        path_found = False
-        final_path=[]
-
         for row in grid.grid:
             for spot in row:
                 if not spot.is_start() and not spot.is_end() and not spot.is_barrier():
@@ -354,15 +548,16 @@ def ida(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_manhatta
 
         start.make_start()
         end.make_end()
-        draw()
+        _new_pass(grid)
+        _expanded(grid, start)
+        yield start
 
-        result=search(start, 0, bound, [start])
+        result, final_path=yield from search(bound)
 
-        if path_found:
+        if final_path:
             for spot in final_path[1:-1]:  # Exclude start și end
                 spot.make_path()
-                draw()
-                pygame.time.delay(30)
+                yield spot
             end.make_end()
             return True
 
@@ -372,9 +567,61 @@ def ida(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_manhatta
 
         bound=result
 
-        if bound>1000:
+        if bound>max_bound:
             print("Bound to big")
             return False
 
     print("Max iterations reached")
-    return False
\ No newline at end of file
+    return False
+
+
+# the blocking versions: run the whole search, calling draw after every step
+
+
+def bfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return run(bfs_steps(grid, start, end), draw)
+
+
+def dfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return run(dfs_steps(grid, start, end), draw)
+
+
+def astar(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance) -> bool:
+    return run(astar_steps(grid, start, end, heuristic), draw)
+
+
+def jps(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance) -> bool:
+    return run(jps_steps(grid, start, end, heuristic), draw)
+
+
+def bidirectional_bfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return run(bidirectional_bfs_steps(grid, start, end), draw)
+
+
+def bidirectional_astar(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance) -> bool:
+    return run(bidirectional_astar_steps(grid, start, end, heuristic), draw)
+
+
+def dls(draw: callable, grid: Grid, start: Spot, end: Spot, limit: int=50) -> bool:
+    return run(dls_steps(grid, start, end, limit), draw)
+
+
+def ucs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return run(ucs_steps(grid, start, end), draw)
+
+
+def greedy(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_euclidian_distance) -> bool:
+    return run(greedy_steps(grid, start, end, heuristic), draw)
+
+
+def iddfs(draw: callable, grid: Grid, start: Spot, end: Spot, max_depth: int=100) -> bool:
+    return run(iddfs_steps(grid, start, end, max_depth), draw)
+
+
+def ida(draw: callable, grid: Grid, start: Spot, end: Spot, heuristic=h_manhattan_distance,
+        max_iterations: int=100, max_bound: float=1000) -> bool:
+    return run(ida_steps(grid, start, end, heuristic, max_iterations, max_bound), draw)
+
+
+def depth_limited_search(draw, grid: Grid, current: Spot, end: Spot, came_from: dict, visited:set, limit: int, depth: int = 0) -> bool:
+    return run(depth_limited_steps(grid, current, end, came_from, visited, limit, depth), draw)
@@ -0,0 +1,205 @@
+from array import array
+from terrain import TerrainCosts, MAX_COST
+from compact_grid import EMPTY, BARRIER, SpotView, _KEEP_MAP_TABLE
+from field_cache import FieldCache
+
+# A grid for maps far too large to allocate whole (e.g. 100k x 100k), when most of the map is empty.
+#
+# Every per-cell sequence is a TiledArray: the flat index space (row*cols+col) is cut into square tiles
+# of TILE x TILE cells, and a tile is only allocated the first time a value other than the default
+# is written into it. Untouched space reads as the default, i.e. free and unvisited.
+#
+# The headless searches (headless.py) run on a SparseGrid unchanged: its barrier mask is a view that
+# also hands out tiled arrays for the bookkeeping of a search (parents, costs, visited flags, the
+# positions in the open list), so a search only allocates the tiles it expands into.
+# The searches and structures that precompute whole-map tables (jps, the vectorized modes, cached_path,
+# Hierarchy, Landmarks, DStarLite, AnytimeAStar) would allocate the whole map, so they raise TypeError
+# on a SparseGrid (see headless._require_dense); use them on CompactGrid instead.
+
+TILE = 64   # a power of two, so the tile of a cell is found with shifts
+
+
+class TiledArray:
+    def __init__(self, rows: int, cols: int, typecode: str, fill=0, tile: int = TILE):
+        """
+        A flat sequence of rows*cols values, indexed by row*cols+col, stored as tiles allocated on first write.
+        Args:
+            rows (int): Number of rows of the map.
+            cols (int): Number of columns of the map.
+            typecode (str): The array typecode of the values (e.g. "B", "i", "d").
+            fill: The value of every cell that was never written.
+            tile (int): The side of the tiles, a power of two.
+        """
+        if tile <= 0 or tile & (tile - 1):
+            raise ValueError(f"tile must be a power of two, got {tile}")
+        self.rows: int = rows
+        self.cols: int = cols
+        self.typecode: str = typecode
+        self.fill = fill
+        self.tile: int = tile
+        self.shift: int = tile.bit_length() - 1
+        self.tile_cols: int = -(-cols // tile)
+        self.size: int = rows * cols
+        self.tiles: dict[int, array] = {}   # tile number -> its tile*tile values, row by row
+        self._blank: array = array(typecode, [fill]) * (tile * tile)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        # without it, bytes(), list() and friends would fall back to __getitem__, which never runs out
+        for idx in range(self.size):
+            yield self[idx]
+
+    # the tile of a cell and the offset inside it are computed inline: these two run for every
+    # cell a search looks at, and a helper call (or a bounds check) would cost as much as the lookup
+    # itself. So indices are not checked: past the end they read as fill.
+
+    def __getitem__(self, idx: int):
+        row, col = divmod(idx, self.cols)
+        shift = self.shift
+        values = self.tiles.get((row >> shift) * self.tile_cols + (col >> shift))
+        if values is None:
+            return self.fill
+        mask = self.tile - 1
+        return values[((row & mask) << shift) | (col & mask)]
+
+    def __setitem__(self, idx: int, value) -> None:
+        row, col = divmod(idx, self.cols)
+        shift = self.shift
+        key = (row >> shift) * self.tile_cols + (col >> shift)
+        values = self.tiles.get(key)
+        if values is None:
+            if value == self.fill:
+                return   # writing the default into untouched space changes nothing
+            values = self.tiles[key] = array(self.typecode, self._blank)
+        mask = self.tile - 1
+        values[((row & mask) << shift) | (col & mask)] = value
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the allocated tiles.
+        """
+        return len(self.tiles) * len(self._blank) * self._blank.itemsize
+
+
+class SparseBarriers:
+    # the barrier mask of a SparseGrid, read through the cells instead of copied out of them
+    __slots__ = ("grid",)
+
+    def __init__(self, grid: "SparseGrid"):
+        self.grid: SparseGrid = grid
+
+    def __len__(self) -> int:
+        return self.grid.rows * self.grid.cols
+
+    def __getitem__(self, idx: int) -> int:
+        return self.grid.cells[idx] & BARRIER
+
+    def __iter__(self):
+        for state in self.grid.cells:
+            yield state & BARRIER
+
+    def allocate(self, typecode: str, fill=0) -> TiledArray:
+        """
+        Hand a search a per-cell array over the same tiles (see headless._new).
+        """
+        return self.grid.allocate(typecode, fill)
+
+
+class SparseGrid(TerrainCosts):
+    def __init__(self, rows: int, cols: int, tile: int = TILE):
+        """
+        A grid with the same cell flags and methods as CompactGrid, whose cells are kept in tiles
+        that are only allocated once something is written into them.
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            tile (int): The side of the tiles, a power of two.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.tile: int = tile
+        self.cells: TiledArray = TiledArray(rows, cols, "B", EMPTY, tile)
+        self.costs: TiledArray | None = None  # traversal cost layer, tiled too (see set_cost)
+        self.jump_table = None
+        self.version: int = 0                 # bumped whenever the barriers or costs change
+        self.field_cache = FieldCache()
+
+    def allocate(self, typecode: str, fill=0) -> TiledArray:
+        """
+        A new per-cell array with the tiling of the grid. Indices do not fit in 32 bits on the largest
+        maps, so "i" arrays are widened to "q" there.
+        """
+        if typecode == "i" and self.rows * self.cols > 0x7FFFFFFF:
+            typecode = "q"
+        return TiledArray(self.rows, self.cols, typecode, fill, self.tile)
+
+    def index(self, row: int, col: int) -> int:
+        """
+        Get the flat index of the cell at (row, col).
+        """
+        return row * self.cols + col
+
+    def position(self, idx: int) -> tuple[int, int]:
+        """
+        Get the (row, col) position of the cell with the given flat index.
+        """
+        return divmod(idx, self.cols)
+
+    def spot(self, row: int, col: int) -> SpotView:
+        """
+        Get a Spot-like view of the cell at (row, col), as on CompactGrid.
+        """
+        return SpotView(self, row, col)
+
+    def barrier_mask(self) -> SparseBarriers:
+        """
+        Get the barriers as a read-only view, indexed by row*cols+col (1 for a barrier, 0 otherwise).
+        Nothing is copied: on a map this size the mask could not be allocated.
+        """
+        return SparseBarriers(self)
+
+    def set_cost(self, row: int, col: int, cost: int) -> None:
+        """
+        Set the cost of moving into the cell at (row, col); the cost layer is tiled like the cells.
+        """
+        if not 1 <= cost <= MAX_COST:
+            raise ValueError(f"cost must be between 1 and {MAX_COST}, got {cost}")
+        if self.costs is None:
+            if cost == 1:
+                return
+            self.costs = self.allocate("B", 1)
+        idx = row * self.cols + col
+        if self.costs[idx] != cost:
+            self.costs[idx] = cost
+            self.version += 1
+
+    def clear_search(self) -> None:
+        """
+        Remove the open, closed and path marks, keeping the barriers, start and end.
+        Tiles left with nothing in them are released.
+        """
+        tiles = self.cells.tiles
+        for key in list(tiles):
+            values = array("B", tiles[key].tobytes().translate(_KEEP_MAP_TABLE))
+            if any(values):
+                tiles[key] = values
+            else:
+                del tiles[key]
+
+    def reset(self) -> None:
+        """
+        Reset every cell to empty and drop the traversal costs, releasing every tile.
+        """
+        self.cells.tiles.clear()
+        self.version += 1
+        self.clear_costs()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the allocated tiles of the cells and the cost layer.
+        """
+        return self.cells.nbytes + (0 if self.costs is None else self.costs.nbytes)
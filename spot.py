@@ -1,8 +1,9 @@
 from utils import *
+from compact_grid import EMPTY, BARRIER, OPEN, CLOSED, START, END, PATH
 
 class Spot:
     # --- Constructor ---
-    def __init__(self, row: int, col: int, width: int, height: int, total_rows: int):
+    def __init__(self, row: int, col: int, width: int, height: int, total_rows: int, grid=None, total_cols: int = None):
         """
         Initialize a spot in the grid.
         Args: 
@@ -11,6 +12,9 @@ class Spot:
             width (int): The width of the spot.
             height (int): The height of the spot.
             total_rows (int): Keeps track of the total number of rows in the grid (while avoiding global variables).
+            grid (Grid, optional): The grid that owns the spot. It is told when the spot becomes (or stops being)
+                a barrier, so it can keep the neighbor lists up to date.
+            total_cols (int, optional): The total number of columns in the grid (total_rows by default, i.e. square).
         """
         # a square has a position in the grid (row, col) and a position in the window (x, y)
         self.row: int = row
@@ -19,11 +23,16 @@ class Spot:
         # the coordinates (x, y) are calculated based on the place inside the grid and its size.
         self.width: int = width
         self.height: int = height
-        self.x: int = row * width
-        self.y: int = col * height
-        self.color: tuple = COLORS["WHITE"]  # default color is white
+        # the rows go down the window and the columns across it
+        self.x: int = col * width
+        self.y: int = row * height
+        # the state is a set of bit flags (see compact_grid.py), the color is derived from it only when drawing
+        self.state: int = EMPTY  # default state is empty (white)
         self.neighbors: list = []
         self.total_rows: int = total_rows
+        self.total_cols: int = total_cols if total_cols is not None else total_rows
+        self.index: int = row * self.total_cols + col  # position in the flat cell list of the grid
+        self.grid = grid
 
     # ---- Methods to change the state of the spot (i.e., its setters) ----
     def get_position(self) -> tuple[int, int]:
@@ -40,7 +49,7 @@ class Spot:
         Returns:
             bool: True if the spot is closed (red), False otherwise.
         """
-        return self.color == COLORS['RED']
+        return self.state & CLOSED != 0
 
     def is_open(self) -> bool:
         """
@@ -48,7 +57,7 @@ class Spot:
         Returns:
             bool: True if the spot is marked as open (green), False otherwise.
         """
-        return self.color == COLORS['GREEN']
+        return self.state & OPEN != 0
 
     def is_barrier(self) -> bool:
         """
@@ -56,7 +65,7 @@ class Spot:
         Returns:
             bool: True if the spot is a barrier (black), False otherwise.
         """
-        return self.color == COLORS['BLACK']
+        return self.state & BARRIER != 0
 
     def is_start(self) -> bool:
         """
@@ -64,32 +73,53 @@ class Spot:
         Returns:
             bool: True if the spot is the start node (orange), False otherwise.
         """
-        return self.color == COLORS['ORANGE']
+        return self.state & START != 0
 
     def is_end(self) -> bool:
         """
-        Checks if the spot is marked as the end node (turquoise).
+        Checks if the spot is marked as the end node (yellow).
         Returns:
-            bool: True if the spot is the end node (turquoise), False otherwise.
+            bool: True if the spot is the end node (yellow), False otherwise.
         """
-        return self.color == COLORS['TURQUOISE']
+        return self.state & END != 0
 
     # ---- Methods to change the state of the spot (i.e., its setters) ----
+    def _set_state(self, state: int) -> None:
+        """
+        Replace the state of the spot. The grid is told that the spot needs redrawing,
+        its hooks are told about the change, and if the barrier flag changed, the grid is told
+        that its neighbors changed.
+        Args:
+            state (int): The new state flags.
+        Returns:
+            None
+        """
+        if state == self.state:
+            return
+        old = self.state
+        self.state = state
+        if self.grid is not None:
+            self.grid.dirty.add(self)
+            for hook in self.grid.hooks:   # see stats.py
+                hook.on_state(self, old, state)
+            if (old ^ state) & BARRIER:
+                self.grid.barrier_changed(self)
+
     def reset(self) -> None:
         """
-        Change the color of the spot back to white (unvisited).
+        Clear every mark of the spot, it goes back to white (unvisited).
         Returns:
             None
         """
-        self.color = COLORS['WHITE']
+        self._set_state(EMPTY)
 
     def make_closed(self) -> None:
         """
-        Mark the spot as closed (red).
+        Mark the spot as closed (red). A closed spot is no longer open.
         Returns:
             None
         """
-        self.color = COLORS['RED']
+        self._set_state((self.state & ~OPEN) | CLOSED)
 
     def make_open(self) -> None:
         """
@@ -97,7 +127,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['GREEN']
+        self._set_state((self.state & ~CLOSED) | OPEN)
 
     def make_barrier(self) -> None:
         """
@@ -105,7 +135,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['BLACK']
+        self._set_state(BARRIER)
 
     def make_start(self) -> None:
         """
@@ -113,7 +143,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['ORANGE']
+        self._set_state(START)
 
     def make_end(self) -> None:
         """
@@ -121,15 +151,15 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['YELLOW']
+        self._set_state(END)
 
     def make_path(self) -> None:
         """
-        Mark the spot as part of the path (purple).
+        Mark the spot as part of the path (purple). The spot keeps its other marks (e.g. closed).
         Returns:
             None
         """
-        self.color = COLORS['PURPLE']
+        self._set_state(self.state | PATH)
 
     # --- Operators ---
     # "Spot" type is not yet defined because the class will be defined at runtime and will exist only after it is closed (the whole class).
@@ -142,23 +172,56 @@ class Spot:
         return False
     
     # --- Other Methods ---
-    def draw(self, win: pygame.Surface) -> None:
+    @property
+    def color(self) -> tuple:
+        """
+        The color of the spot, derived from its state. Barrier, start and end win over the search marks,
+        and the path wins over closed/open.
+        Returns:
+            tuple: The RGB color used to draw the spot.
+        """
+        state = self.state
+        if state & BARRIER:
+            return COLORS['BLACK']
+        if state & START:
+            return COLORS['ORANGE']
+        if state & END:
+            return COLORS['YELLOW']
+        if state & PATH:
+            return COLORS['PURPLE']
+        if state & CLOSED:
+            return COLORS['RED']
+        if state & OPEN:
+            return COLORS['GREEN']
+        return COLORS['WHITE']
+
+    def draw(self, win: pygame.Surface) -> pygame.Rect:
         """
         Draw the spot on the given Pygame surface (window).
         Args:
             win (pygame.Surface): The Pygame surface (window) where the spot will be drawn.
+        Returns:
+            pygame.Rect: The area that was drawn.
         """
-        # draw a rectangle at (x, y) with size (width, width) and color self.color
-        pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.width))
+        # draw a rectangle at (x, y) with size (width, height) and color self.color
+        return pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.height))
 
     def update_neighbors(self, grid: list[list["Spot"]]) -> None:
         """
-        Update the list of neighbor spots that are not barriers.
+        Update the list of neighbor spots that are not barriers, in the order down, up, right, left.
+        When the spot belongs to a Grid, the candidates come from the offsets the grid precomputed
+        over its flat cell list, so there are no bounds to check here.
         Args:
             grid (list[list[Spot]]): The 2D list (matrix) representing the grid of Spot objects.
         Returns:
             None
         """
+        if self.grid is not None:
+            cells = self.grid.cells
+            idx = self.index
+            self.neighbors = [cells[idx + offset] for offset in self.grid.offsets[idx]
+                              if not cells[idx + offset].state & BARRIER]
+            return
         self.neighbors = []
         # DOWN
         if self.row < self.total_rows - 1 and not grid[self.row + 1][self.col].is_barrier():
@@ -167,7 +230,7 @@ class Spot:
         if self.row > 0 and not grid[self.row - 1][self.col].is_barrier():
             self.neighbors.append(grid[self.row - 1][self.col])
         # RIGHT
-        if self.col < self.total_rows - 1 and not grid[self.row][self.col + 1].is_barrier():
+        if self.col < self.total_cols - 1 and not grid[self.row][self.col + 1].is_barrier():
             self.neighbors.append(grid[self.row][self.col + 1])
         # LEFT
         if self.col > 0 and not grid[self.row][self.col - 1].is_barrier():
@@ -0,0 +1,137 @@
+import time
+from compact_grid import OPEN, CLOSED
+
+# Instrumentation for the visual searches (searching_algorithms.py).
+# A SearchHook is told about:
+#   - every step the search generator yields (run() and main.py call on_step),
+#   - every spot the search expands, and every new pass of the iterative deepening searches (the
+#     generators tell the hooks in grid.hooks; a step is not always an expansion: the depth-first
+#     searches also yield when they backtrack or cut a path off),
+#   - every state change of a spot (Spot tells the hooks in grid.hooks),
+#   - every heuristic call, when the search is given a heuristic wrapped by counted(),
+#   - the time spent drawing.
+# StatsHook turns those events into a SearchStats; other hooks (profilers, loggers, ...) can
+# subclass SearchHook and override only what they need.
+
+
+class SearchStats:
+    def __init__(self):
+        """
+        What one run of a search did.
+        """
+        self.expanded: int = 0            # spots expanded, counted like the expanded of headless.py
+        self.generated: int = 0           # spots that were put on the open list
+        self.reopened: int = 0            # of those, spots that had already been closed in the same pass
+        self.max_frontier: int = 0        # the largest number of open spots at the same time
+        self.heuristic_calls: int = 0
+        self.draw_seconds: float = 0      # time spent in the draw callback
+        self.total_seconds: float = 0     # from the first step to the end, drawing included
+        self.found: bool | None = None    # None while the search runs
+
+    def lines(self) -> list[str]:
+        """
+        The stats as short lines of text (for printing, or for the overlay of main.py).
+        """
+        found = "running" if self.found is None else ("path found" if self.found else "no path")
+        return [
+            found,
+            f"expanded: {self.expanded}",
+            f"generated: {self.generated}",
+            f"re-opened: {self.reopened}",
+            f"max frontier: {self.max_frontier}",
+            f"heuristic calls: {self.heuristic_calls}",
+            f"drawing: {self.draw_seconds * 1000:.1f} ms",
+            f"total: {self.total_seconds * 1000:.1f} ms",
+        ]
+
+    def __repr__(self) -> str:
+        return "SearchStats(" + ", ".join(self.lines()) + ")"
+
+
+class SearchHook:
+    """
+    The events of a search. Every method does nothing here; subclasses override the ones they need.
+    """
+    def on_start(self) -> None:
+        pass
+
+    def on_step(self, spot) -> None:
+        pass
+
+    def on_expand(self, spot) -> None:
+        pass
+
+    def on_pass(self) -> None:
+        pass
+
+    def on_state(self, spot, old: int, new: int) -> None:
+        pass
+
+    def on_heuristic(self) -> None:
+        pass
+
+    def on_draw(self, seconds: float) -> None:
+        pass
+
+    def on_finish(self, found: bool) -> None:
+        pass
+
+
+class StatsHook(SearchHook):
+    def __init__(self, stats: SearchStats = None):
+        """
+        Fill a SearchStats from the events of a search.
+        Args:
+            stats (SearchStats, optional): The object to fill (a new one by default).
+        """
+        self.stats: SearchStats = stats if stats is not None else SearchStats()
+        self.open: int = 0   # spots open right now
+        self.closed: set = set()   # spots closed in the current pass
+        self.started: float = 0
+
+    def on_start(self) -> None:
+        self.started = time.perf_counter()
+
+    def on_step(self, spot) -> None:
+        self.stats.total_seconds = time.perf_counter() - self.started
+
+    def on_expand(self, spot) -> None:
+        self.stats.expanded += 1
+
+    def on_pass(self) -> None:
+        # the spots a new deepening pass opens again were closed by the pass before, not re-opened
+        self.closed.clear()
+
+    def on_state(self, spot, old: int, new: int) -> None:
+        if new & CLOSED:
+            self.closed.add(spot)
+        if new & OPEN and not old & OPEN:
+            self.stats.generated += 1
+            if spot in self.closed:
+                self.stats.reopened += 1
+            self.open += 1
+            if self.open > self.stats.max_frontier:
+                self.stats.max_frontier = self.open
+        elif old & OPEN and not new & OPEN:
+            self.open -= 1
+
+    def on_heuristic(self) -> None:
+        self.stats.heuristic_calls += 1
+
+    def on_draw(self, seconds: float) -> None:
+        self.stats.draw_seconds += seconds
+
+    def on_finish(self, found: bool) -> None:
+        self.stats.found = found
+        self.stats.total_seconds = time.perf_counter() - self.started
+
+
+def counted(heuristic: callable, hooks: list[SearchHook]) -> callable:
+    """
+    Wrap a heuristic so that every call is reported to the hooks.
+    """
+    def wrapper(a: tuple[int, int], b: tuple[int, int]) -> float:
+        for hook in hooks:
+            hook.on_heuristic()
+        return heuristic(a, b)
+    return wrapper
@@ -0,0 +1,58 @@
+# some terrain presets (the cost of moving into a cell)
+ROAD = 1
+GRASS = 2
+SLOPE = 3
+MUD = 5
+
+MAX_COST = 255   # costs are stored in one byte per cell
+
+
+class TerrainCosts:
+    """
+    Per-cell traversal costs, shared by Grid and CompactGrid.
+    The costs live in a flat bytearray indexed by row*cols+col, and it is only allocated when the first
+    cost other than 1 is set. While self.costs is None every move costs 1, and the searches keep their
+    unit-cost code path.
+    Every change of the costs counts as a change of the map (version), like a change of the barriers.
+    """
+    rows: int
+    cols: int
+    costs: bytearray | None = None
+    version: int = 0   # bumped whenever the map (barriers or costs) changes
+
+    def set_cost(self, row: int, col: int, cost: int) -> None:
+        """
+        Set the cost of moving into the cell at (row, col).
+        Args:
+            row (int): The row of the cell.
+            col (int): The column of the cell.
+            cost (int): The cost, between 1 and MAX_COST.
+        Returns:
+            None
+        """
+        if not 1 <= cost <= MAX_COST:
+            raise ValueError(f"cost must be between 1 and {MAX_COST}, got {cost}")
+        if self.costs is None:
+            if cost == 1:
+                return
+            self.costs = bytearray(b"\x01") * (self.rows * self.cols)
+        idx = row * self.cols + col
+        if self.costs[idx] != cost:
+            self.costs[idx] = cost
+            self.version += 1
+
+    def get_cost(self, row: int, col: int) -> int:
+        """
+        Get the cost of moving into the cell at (row, col).
+        """
+        if self.costs is None:
+            return 1
+        return self.costs[row * self.cols + col]
+
+    def clear_costs(self) -> None:
+        """
+        Drop the cost layer, every move costs 1 again.
+        """
+        if self.costs is not None:
+            self.costs = None
+            self.version += 1
@@ -0,0 +1,110 @@
+import numpy as np
+from jps import DOWN, UP, RIGHT, LEFT
+
+# Breadth-first flood fill where every move costs 1, done one whole wave at a time with NumPy.
+# The wave at distance d is kept as an array of flat cell indices. The wave at distance d+1 is made of
+# the wave shifted by one cell in each direction (index + offset), keeping the shifted cells that are
+# free and not reached yet, which is a lookup in a boolean mask of the open cells.
+# That replaces the per-cell Python loop of bfs by a few array operations per wave, and a wave costs
+# time in proportion to its size, not to the size of the grid.
+
+UNREACHED = -1
+
+
+class DistanceField:
+    def __init__(self, rows: int, cols: int, source: int, dist: np.ndarray, parents: np.ndarray, max_wave: int = 1):
+        """
+        The result of a flood fill from one cell.
+        Args:
+            rows (int): Number of rows of the map.
+            cols (int): Number of columns of the map.
+            source (int): The flat index of the cell the fill started from.
+            dist (np.ndarray): rows x cols int32, the number of moves from source, UNREACHED (-1) if not reached.
+            parents (np.ndarray): rows x cols int8, the direction of the move that reached each cell
+                (DOWN, UP, RIGHT or LEFT from jps.py), -1 for the source and the cells not reached.
+            max_wave (int): The number of cells in the largest wave.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.source: int = source
+        self.dist: np.ndarray = dist
+        self.parents: np.ndarray = parents
+        self.max_wave: int = max_wave
+
+    def distance(self, idx: int) -> int:
+        """
+        Get the number of moves from the source to the cell with the given flat index, UNREACHED if there is no path.
+        """
+        return int(self.dist.flat[idx])
+
+    def reached(self) -> int:
+        """
+        Get the number of cells the fill reached (the source included).
+        """
+        return int(np.count_nonzero(self.dist >= 0))
+
+    def path_to(self, idx: int) -> list[int]:
+        """
+        Walk the parent directions back from a cell to the source.
+        Args:
+            idx (int): The flat index of the cell.
+        Returns:
+            list[int]: The flat indices from the source to idx (both included), empty if idx was not reached.
+        """
+        if self.dist.flat[idx] < 0:
+            return []
+        cols = self.cols
+        back = {DOWN: -cols, UP: cols, RIGHT: -1, LEFT: 1}   # from a cell to the cell it was reached from
+        parents = self.parents.ravel()
+        path = [idx]
+        while idx != self.source:
+            idx += back[parents[idx]]
+            path.append(idx)
+        path.reverse()
+        return path
+
+
+def distance_field(rows: int, cols: int, walls: bytes, source: int, target: int = -1) -> DistanceField:
+    """
+    Flood fill the map from source with unit costs.
+    Args:
+        rows (int): Number of rows of the map.
+        cols (int): Number of columns of the map.
+        walls (bytes): The barrier mask (1 = barrier), indexed by row*cols+col.
+        source (int): The flat index of the cell to start from.
+        target (int): Stop as soon as this cell is reached (-1: fill everything reachable).
+    Returns:
+        DistanceField: The distances and parent directions (cells beyond the target's wave stay UNREACHED).
+    """
+    n = rows * cols
+    open_cells = np.frombuffer(bytes(walls), dtype=np.uint8) == 0   # free cells not reached yet
+    dist = np.full(n, UNREACHED, dtype=np.int32)
+    parents = np.full(n, -1, dtype=np.int8)
+    col_of = np.arange(n, dtype=np.int32) % cols
+
+    dist[source] = 0
+    open_cells[source] = False
+    wave = np.array([source], dtype=np.int32)
+
+    d = 0
+    max_wave = 1
+    while wave.size:
+        if target >= 0 and dist[target] >= 0:
+            break
+        d += 1
+        parts = []
+        # same order as the neighbor lists: down, up, right, left; the first one to reach a cell keeps it
+        for direction, offset, inside in ((DOWN, cols, wave < n - cols),
+                                          (UP, -cols, wave >= cols),
+                                          (RIGHT, 1, col_of[wave] < cols - 1),
+                                          (LEFT, -1, col_of[wave] > 0)):
+            cells = wave[inside] + offset
+            cells = cells[open_cells[cells]]
+            open_cells[cells] = False
+            parents[cells] = direction
+            parts.append(cells)
+        wave = np.concatenate(parts)
+        dist[wave] = d
+        max_wave = max(max_wave, wave.size)
+
+    return DistanceField(rows, cols, source, dist.reshape(rows, cols), parents.reshape(rows, cols), max_wave)